@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from PyQt5.QtCore import QObject, QStringListModel, Qt, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QCompleter, QLineEdit
+
+from geocoding import Suggestion, normalize_query
+from weather_api import FORECAST_CACHE, LANG, UNITS, fetch_forecast, geocode_location, suggest_locations
+from workers import Worker
+
+LOCAL_DEBOUNCE_MS = 120
+REMOTE_DEBOUNCE_MS = 600
+# Remote lookups only for queries at least this long that no local source can complete.
+MIN_REMOTE_CHARS = 3
+MAX_SUGGESTIONS = 6
+
+
+class LocationCompleter(QObject):
+    """Type-ahead suggestions for a location ``QLineEdit``.
+
+    Each keystroke restarts two timers. The short one queries the geocode
+    cache and gazetteer, which is local and cheap. The long one falls back to
+    the remote geocoder, but only when nothing local matched. At most one
+    remote lookup runs at a time and each normalized query is sent once, so
+    typing costs a bounded number of remote calls. Results for outdated text
+    are dropped. The top suggestion's forecast is prefetched, so choosing it
+    renders from a warm cache.
+    """
+
+    chosen = pyqtSignal(str, object)  # label, {"lat", "lon"}
+
+    def __init__(self, line_edit: QLineEdit, thread_pool: Optional[QThreadPool] = None, parent=None):
+        super().__init__(parent or line_edit)
+        self.line_edit = line_edit
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.setWidget(line_edit)
+        self.completer.activated[str].connect(self._on_activated)
+
+        self._suggestions: Dict[str, Suggestion] = {}
+        self._local_worker: Optional[Worker] = None
+        self._remote_in_flight = False
+        self._remote_done: Set[str] = set()
+        self._prefetched: Set[Tuple[float, float]] = set()
+        self._prefetching = False
+
+        self._local_timer = self._single_shot(LOCAL_DEBOUNCE_MS, self._lookup_local)
+        self._remote_timer = self._single_shot(REMOTE_DEBOUNCE_MS, self._lookup_remote)
+        line_edit.textEdited.connect(self._on_text_edited)
+
+    def _single_shot(self, interval: int, slot) -> QTimer:
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(interval)
+        timer.timeout.connect(slot)
+        return timer
+
+    def _on_text_edited(self, text: str):
+        self._local_timer.start()
+        self._remote_timer.start()
+        if not text.strip():
+            self._show([])
+
+    def _lookup_local(self):
+        text = self.line_edit.text()
+        if self._local_worker is not None:
+            self._local_worker.cancel()
+        if not text.strip():
+            return
+        worker = self._local_worker = Worker(suggest_locations, text, MAX_SUGGESTIONS)
+        worker.signals.result.connect(lambda suggestions: self._on_local(text, suggestions))
+        self.thread_pool.start(worker)
+
+    def _on_local(self, text: str, suggestions: List[Suggestion]):
+        if text != self.line_edit.text():
+            return
+        self._local_worker = None
+        self._show(suggestions)
+
+    def _lookup_remote(self):
+        text = self.line_edit.text().strip()
+        query = normalize_query(text)
+        if len(query) < MIN_REMOTE_CHARS or query in self._remote_done or self._suggestions:
+            return
+        if self._remote_in_flight:
+            # Retried for the then-current text once the running lookup finishes.
+            return
+        self._remote_in_flight = True
+        self._remote_done.add(query)
+        # Not remembered: the text may be half-typed and would come back as a suggestion.
+        worker = Worker(geocode_location, text, False)
+        worker.signals.result.connect(lambda coords: self._on_remote(text, coords))
+        worker.signals.finished.connect(self._on_remote_finished)
+        self.thread_pool.start(worker)
+
+    def _on_remote(self, text: str, coords: Optional[Dict[str, float]]):
+        if coords is None or text != self.line_edit.text().strip():
+            return
+        self._show([Suggestion(text, coords["lat"], coords["lon"])])
+
+    def _on_remote_finished(self):
+        self._remote_in_flight = False
+        if not self._remote_timer.isActive():
+            self._lookup_remote()
+
+    def _show(self, suggestions: List[Suggestion]):
+        self._suggestions = {suggestion.label: suggestion for suggestion in suggestions}
+        self.model.setStringList(list(self._suggestions))
+        if suggestions and self.line_edit.hasFocus():
+            self.completer.complete()
+            self._prefetch(suggestions[0])
+        else:
+            self.completer.popup().hide()
+
+    def _prefetch(self, suggestion: Suggestion):
+        key = (round(suggestion.lat, 2), round(suggestion.lon, 2))
+        if self._prefetching or key in self._prefetched:
+            return
+        cached = FORECAST_CACHE.peek(suggestion.lat, suggestion.lon, UNITS, LANG)
+        if cached is not None and cached.fresh:
+            return
+        self._prefetching = True
+        self._prefetched.add(key)
+        worker = Worker(fetch_forecast, {"lat": suggestion.lat, "lon": suggestion.lon})
+        worker.signals.finished.connect(self._on_prefetch_finished)
+        self.thread_pool.start(worker)
+
+    def _on_prefetch_finished(self):
+        self._prefetching = False
+
+    def coords_for(self, label: str) -> Optional[Dict[str, float]]:
+        """Coordinates of the currently offered suggestion called ``label``, if any."""
+        suggestion = self._suggestions.get(label)
+        return None if suggestion is None else {"lat": suggestion.lat, "lon": suggestion.lon}
+
+    def _on_activated(self, label: str):
+        # The completer is attached with setWidget, which leaves the text to us.
+        self.line_edit.setText(label)
+        coords = self.coords_for(label)
+        if coords is not None:
+            self.chosen.emit(label, coords)
@@ -0,0 +1,225 @@
+"""Headless batch forecasting for many locations.
+
+    python batch.py locations.csv -o forecasts.jsonl
+    python batch.py locations.jsonl -o forecasts.parquet --forecast-concurrency 8
+
+Input rows need a ``location`` column/key, or ``lat`` and ``lon`` to skip
+geocoding. JSONL output has one object per location; Parquet output (needs
+``pyarrow``) has one row per forecast point. Never imports PyQt5 or
+matplotlib.
+"""
+import argparse
+import csv
+import json
+import sys
+import threading
+import time
+import typing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from forecast_parser import WeatherPoint, parse_forecast
+from geocoding import RateLimiter
+from metrics import start_exporter
+from weather_api import FORECAST_CACHE, LANG, UNITS, fetch_forecast, geocode_location, set_geocode_rate
+
+PARQUET_ROW_GROUP = 10000
+
+
+class ProviderLimit:
+    """Caps how many calls to one provider run at once and how often they start."""
+
+    def __init__(self, concurrency: int, rate: float = 0.0):
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._rate_limiter = RateLimiter(1.0 / rate) if rate > 0 else None
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+
+
+def read_locations(path: str) -> Iterator[dict]:
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                yield {"location": row} if isinstance(row, str) else row
+    else:
+        with open(path, newline="", encoding="utf-8") as fh:
+            yield from csv.DictReader(fh)
+
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        self._fh = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, record: dict):
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._fh is not sys.stdout:
+            self._fh.close()
+
+
+def _arrow_type(pa, annotation):
+    # Optional[X] columns are nullable X; the schema is fixed up front so a row
+    # group where a column happens to be all None can't be inferred as "null".
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    annotation = args[0] if args else annotation
+    return {str: pa.string(), int: pa.int64(), float: pa.float64()}[annotation]
+
+
+class ParquetWriter:
+    """Streams one row per ``WeatherPoint`` in row groups of ``PARQUET_ROW_GROUP``."""
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        fields = [("location", pa.string()), ("lat", pa.float64()), ("lon", pa.float64()), ("kind", pa.string())]
+        fields += [(name, _arrow_type(pa, annotation))
+                   for name, annotation in typing.get_type_hints(WeatherPoint).items()]
+        self._schema = pa.schema(fields)
+        self._rows: Dict[str, list] = {name: [] for name, _ in fields}
+        self._writer = None
+        self._path = path
+        self._pq = pq
+
+    def write(self, record: dict):
+        if "error" in record:
+            return
+        for kind in ("hourly", "daily"):
+            for point in record[kind]:
+                self._rows["location"].append(record["location"])
+                self._rows["lat"].append(record["lat"])
+                self._rows["lon"].append(record["lon"])
+                self._rows["kind"].append(kind)
+                for name, value in point.items():
+                    self._rows[name].append(value)
+        if len(self._rows["kind"]) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows["kind"]:
+            return
+        table = self._pa.table(self._rows, schema=self._schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(table)
+        for column in self._rows.values():
+            column.clear()
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def process_location(row: dict, geocode_limit: ProviderLimit, forecast_limit: ProviderLimit,
+                     hours: int, days: int) -> Tuple[dict, float]:
+    start = time.perf_counter()
+    name = (row.get("location") or "").strip()
+    record: Dict[str, object] = {"location": name}
+    try:
+        if row.get("lat") not in (None, "") and row.get("lon") not in (None, ""):
+            coords: Optional[Dict[str, float]] = {"lat": float(row["lat"]), "lon": float(row["lon"])}
+        else:
+            with geocode_limit:
+                coords = geocode_location(name)
+        if coords is None:
+            record["error"] = "location not found"
+            return record, time.perf_counter() - start
+        record.update(coords)
+        cached = FORECAST_CACHE.get(coords["lat"], coords["lon"], UNITS, LANG)
+        if cached is not None and cached.fresh:
+            forecast = parse_forecast(cached.data, hours, days)
+        else:
+            with forecast_limit:
+                forecast = fetch_forecast(coords)
+        record["hourly"] = [wp._asdict() for wp in forecast.hourly.points[:hours]]
+        record["daily"] = [wp._asdict() for wp in forecast.daily.points[:days]]
+    except Exception as exc:
+        record["error"] = str(exc)
+    return record, time.perf_counter() - start
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run(args: argparse.Namespace) -> int:
+    set_geocode_rate(args.geocode_rate)
+    geocode_limit = ProviderLimit(args.geocode_concurrency)
+    forecast_limit = ProviderLimit(args.forecast_concurrency, args.forecast_rate)
+    writer = ParquetWriter(args.output) if args.output.endswith(".parquet") else JsonlWriter(args.output)
+    exporter = start_exporter()
+    workers = args.geocode_concurrency + args.forecast_concurrency
+    latencies: List[float] = []
+    errors = 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        rows = read_locations(args.input)
+        exhausted = False
+        while pending or not exhausted:
+            # Keep a bounded window in flight so huge inputs are streamed, not loaded.
+            while not exhausted and len(pending) < workers * 4:
+                row = next(rows, None)
+                if row is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(process_location, row, geocode_limit, forecast_limit,
+                                        args.hours, args.days))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record, latency = future.result()
+                latencies.append(latency)
+                errors += "error" in record
+                writer.write(record)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    if exporter is not None:
+        exporter.stop()
+
+    latencies.sort()
+    print(
+        f"{len(latencies)} locations in {elapsed:.2f}s "
+        f"({len(latencies) / elapsed if elapsed else 0.0:.1f} loc/s), {errors} errors\n"
+        f"latency p50={percentile(latencies, 50):.3f}s p95={percentile(latencies, 95):.3f}s "
+        f"p99={percentile(latencies, 99):.3f}s max={latencies[-1] if latencies else 0.0:.3f}s",
+        file=sys.stderr,
+    )
+    return 1 if errors and errors == len(latencies) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch forecasts for many locations without the GUI.")
+    parser.add_argument("input", help="CSV or JSONL file with a 'location' column or 'lat'/'lon' columns")
+    parser.add_argument("-o", "--output", default="-", help="output .jsonl/.parquet file ('-' for stdout)")
+    parser.add_argument("--geocode-concurrency", type=int, default=2)
+    parser.add_argument("--geocode-rate", type=float, default=1.0,
+                        help="max remote geocoding requests per second (0 = unlimited)")
+    parser.add_argument("--forecast-concurrency", type=int, default=8)
+    parser.add_argument("--forecast-rate", type=float, default=0.0,
+                        help="max forecast requests per second (0 = unlimited)")
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--days", type=int, default=7)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
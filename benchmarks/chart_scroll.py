@@ -0,0 +1,107 @@
+"""Frames per second while scrolling the selection through the hourly chart.
+
+    python benchmarks/chart_scroll.py --points 24 --rounds 5
+
+Renders on matplotlib's Agg canvas, so no display is needed. ``TemperatureChart``
+gets ``set_data`` once and then ``highlight(i)`` for every point; the previous
+approach cleared and redrew the whole figure for every selection, as
+``legacy_plot_temperatures`` does. Agg has no window, so the final copy of
+the blitted region to the screen isn't included.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from chart import TemperatureChart  # noqa: E402
+from forecast_parser import parse_forecast  # noqa: E402
+from mock_server import mock_forecast  # noqa: E402
+
+
+def legacy_plot_temperatures(figure: Figure, canvas, temps, labels, title: str, xlabel: str):
+    """``WeatherWindow.plot_temperatures`` before the chart kept its artists."""
+    figure.clear()
+    ax = figure.add_subplot(111)
+    ax.set_facecolor("#F5F9FF")
+    figure.set_facecolor("#F5F9FF")
+    x = np.arange(len(temps))
+    ax.plot(x, temps, color="#4A90E2", marker="o", markerfacecolor="#A1C4FD", markeredgecolor="#2C3E50",
+            linewidth=2, zorder=3)
+    ax.fill_between(x, temps, min(temps) - 2, color="#A1C4FD", alpha=0.25, zorder=2)
+    if len(temps) <= 12:
+        for i, temp in enumerate(temps):
+            ax.text(i, temp + 0.5, f"{temp:.1f}°", ha="center", va="bottom", fontsize=10, color="#2C3E50",
+                    fontweight="bold", zorder=4)
+    max_labels = 10 if len(temps) > 10 else len(temps)
+    step = max(1, len(temps) // max_labels)
+    shown_labels = [label if (i % step == 0 or i == len(temps) - 1) else "" for i, label in enumerate(labels)]
+    ax.set_xticks(x)
+    ax.set_xticklabels(shown_labels, rotation=35, ha="right", fontsize=9)
+    ax.set_title(title, color="#2C3E50", fontsize=15, fontweight="bold", pad=15)
+    ax.set_ylabel("Temperatura (°C)", color="#2C3E50", fontsize=12)
+    ax.set_xlabel(xlabel, color="#2C3E50", fontsize=12)
+    ax.tick_params(axis='x', colors="#2C3E50", labelsize=10)
+    ax.tick_params(axis='y', colors="#2C3E50", labelsize=10)
+    ax.grid(True, alpha=0.25, color="#B0C4DE", linestyle='--', zorder=1)
+    for spine in ax.spines.values():
+        spine.set_color("#B0C4DE")
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    figure.tight_layout(pad=2.0)
+    canvas.draw()
+
+
+def new_canvas():
+    figure = Figure(figsize=(8, 4), dpi=100)
+    return figure, FigureCanvasAgg(figure)
+
+
+def scroll_legacy(temps, labels, rounds: int) -> float:
+    figure, canvas = new_canvas()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _i in range(len(temps)):
+            legacy_plot_temperatures(figure, canvas, temps, labels, "Próximas horas", "Hora")
+    return time.perf_counter() - start
+
+
+def scroll_chart(temps, labels, rounds: int) -> float:
+    figure, canvas = new_canvas()
+    chart = TemperatureChart(figure, canvas)
+    chart.set_data(temps, labels, "Próximas horas", "Hora")
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i in range(len(temps)):
+            chart.highlight(i)
+        chart.highlight(None)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=24, help="hourly points in the chart")
+    parser.add_argument("--rounds", type=int, default=5, help="times the selection scrolls through every point")
+    args = parser.parse_args()
+
+    hourly = parse_forecast(mock_forecast(40.4, -3.7), hours=args.points).hourly
+    temps, labels = list(hourly.temp), [wp.dt_txt for wp in hourly]
+    frames = args.rounds * len(temps)
+    # One warm-up draw, so font loading isn't measured.
+    legacy_plot_temperatures(*new_canvas(), temps, labels, "Próximas horas", "Hora")
+
+    legacy = scroll_legacy(temps, labels, args.rounds)
+    chart = scroll_chart(temps, labels, args.rounds)
+    print(f"{frames} selections over {len(temps)} points")
+    print(f"plot_temperatures (redraw): {frames / legacy:8.1f} fps  {legacy / frames * 1000:7.2f} ms/frame")
+    print(f"TemperatureChart.highlight: {frames / chart:8.1f} fps  {chart / frames * 1000:7.2f} ms/frame")
+    print(f"speedup: {legacy / chart:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cost of showing an entry's details: ``DetailsView.show_point`` vs. the old ``QLabel.setText``.
+
+    python benchmarks/details_select.py --rounds 5
+
+Selects every hourly and daily entry of a mock forecast in turn and repaints
+the panel after each one. ``DetailsView`` is timed on first visits, when the
+HTML is rendered and parsed, and on revisits, when the parsed document is
+reused. The old path built an f-string and called ``QLabel.setText`` on
+every selection. Runs offscreen unless ``QT_QPA_PLATFORM`` says otherwise.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QLabel  # noqa: E402
+
+from details import DetailsView, render_details  # noqa: E402
+from forecast_parser import emoji_for, parse_forecast  # noqa: E402
+from mock_server import mock_forecast  # noqa: E402
+from rules import assess  # noqa: E402
+
+SIZE = (420, 320)
+
+
+def legacy_label() -> QLabel:
+    label = QLabel("Selecciona una hora o día")
+    label.setAlignment(Qt.AlignCenter)
+    label.setWordWrap(True)
+    label.setStyleSheet(
+        "font-size: 16px; color: #2C3E50; background: #F5F9FF; border-radius: 10px; padding: 0 12px 12px 12px; text-align: center;"
+    )
+    return label
+
+
+def legacy_update_details(label: QLabel, wp, recommendations):
+    """``WeatherWindow.update_details`` before the details panel kept its documents."""
+    emoji = emoji_for(wp.icon)
+    clouds, dew_point, uvi = wp.clouds, wp.dew_point, wp.uvi
+    details_html = f'''
+        <div style="display: flex; align-items: center; gap: 18px;">
+            <span style="font-size: 4.5em; width:90px; height:90px; display: flex; align-items: center; justify-content: center; background: #EAF1FB; border-radius: 18px; box-shadow: 0 2px 8px #A1C4FD55;">{emoji}</span>
+            <div style="flex:1;">
+                <div style="font-size: 1.5em; font-weight: bold; color: #2C3E50; margin-bottom: 2px;">{wp.dt_txt}</div>
+                <div style="font-size: 1.2em; color: #4A90E2; font-weight: bold;">{wp.weather.capitalize()}</div>
+                <div style="margin-top: 8px;">
+                    <span style="font-size: 1.1em; color: #2C3E50;">🌡️ {wp.temp} °C</span> &nbsp;
+                    <span style="color: #7B8FA1;">Sensación: {wp.feels_like} °C</span>
+                </div>
+                <div style="margin-top: 4px; color: #2C3E50;">
+                    💧 {wp.humidity}% &nbsp; | &nbsp; ⬇️ {wp.pressure} hPa
+                </div>
+                <div style="margin-top: 4px; color: #2C3E50;">
+                    ☁️ Nubes: {clouds if clouds is not None else '-'}% &nbsp; | &nbsp; 🧊 Punto de rocío: {dew_point if dew_point is not None else '-'}°C &nbsp; | &nbsp; ☀️ UV: {uvi if uvi is not None else '-'}
+                </div>
+                <div style="margin-top: 10px; font-size: 1.1em; color: #4A90E2; font-weight: bold;">
+                    {'<br>'.join(recommendations)}
+                </div>
+            </div>
+        </div>
+        '''
+    label.setText(details_html)
+
+
+def time_selections(widget, select, entries, rounds: int) -> float:
+    """Seconds per selection, each followed by a synchronous repaint."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for wp, recommendations in entries:
+            select(widget, wp, recommendations)
+            widget.repaint()
+    return (time.perf_counter() - start) / (rounds * len(entries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="passes over every entry")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)  # noqa: F841
+
+    forecast = parse_forecast(mock_forecast(40.4, -3.7), hours=48, days=8)
+    entries = []
+    for series in (forecast.hourly, forecast.daily):
+        entries += zip(series.points, assess(series.points).recommendations)
+
+    label = legacy_label()
+    view = DetailsView("Selecciona una hora o día")
+    for widget in (label, view):
+        widget.resize(*SIZE)
+        widget.show()
+    # Warm up fonts and the emoji glyph cache with an entry outside the measured set.
+    extra = parse_forecast(mock_forecast(-12.0, -77.0), hours=1).hourly.points[0]
+    legacy_update_details(label, extra, ("-",))
+    label.repaint()
+    view.show_point(extra, ("-",))
+    view.repaint()
+
+    legacy = time_selections(label, legacy_update_details, entries, args.rounds)
+    render_details.cache_clear()
+    first = time_selections(view, DetailsView.show_point, entries, 1)
+    revisit = time_selections(view, DetailsView.show_point, entries, args.rounds)
+    print(f"{len(entries)} entries, {args.rounds} rounds")
+    for name, seconds in (("QLabel.setText (every selection)", legacy),
+                          ("DetailsView.show_point, first visit", first),
+                          ("DetailsView.show_point, revisit", revisit)):
+        print(f"{name:<37}{seconds * 1000:7.3f} ms/selection  ({legacy / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Time until the map shows a location: bundled Leaflet page vs. regenerated folium HTML.
+
+    python benchmarks/map_load.py --locations 5
+
+The bundled page (``assets/map.html``) is loaded once, until ``loadFinished``;
+each location is then a ``showLocation`` call, timed until its JavaScript
+callback returns. The previous approach built a folium page for every
+location and handed it to ``setHtml``, timed here until ``loadFinished``.
+That page pulls Leaflet from a CDN, so run both with the same network.
+Needs PyQtWebEngine; the folium half also needs ``pip install folium``.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, Qt, QTimer, QUrl  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from main import MAP_PAGE  # noqa: E402
+from mock_server import mock_geocode  # noqa: E402
+
+CITIES = ("Lima", "Madrid", "Ciudad de México", "Buenos Aires", "Bogotá", "Santiago", "Quito", "Montevideo")
+TIMEOUT_MS = 60000
+
+
+def wait_for(signal):
+    loop = QEventLoop()
+    signal.connect(loop.quit)
+    QTimer.singleShot(TIMEOUT_MS, loop.quit)
+    loop.exec_()
+    signal.disconnect(loop.quit)
+
+
+def run_js(page, code: str):
+    loop = QEventLoop()
+    page.runJavaScript(code, lambda _result: loop.quit())
+    QTimer.singleShot(TIMEOUT_MS, loop.quit)
+    loop.exec_()
+
+
+def new_view():
+    from PyQt5.QtWebEngineWidgets import QWebEngineSettings, QWebEngineView
+    view = QWebEngineView()
+    view.settings().setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
+    view.resize(800, 600)
+    view.show()
+    return view
+
+
+def time_bundled(locations):
+    """Seconds to load the page, then for each ``showLocation`` call."""
+    view = new_view()
+    start = time.perf_counter()
+    view.load(QUrl.fromLocalFile(MAP_PAGE))
+    wait_for(view.loadFinished)
+    load = time.perf_counter() - start
+    updates = []
+    for lat, lon, label in locations:
+        start = time.perf_counter()
+        run_js(view.page(), f"showLocation({lat}, {lon}, {json.dumps(label)});")
+        updates.append(time.perf_counter() - start)
+    view.close()
+    return load, updates
+
+
+def time_folium(locations):
+    """Seconds to build and load a folium page for each location."""
+    import folium
+    view = new_view()
+    updates = []
+    for lat, lon, label in locations:
+        start = time.perf_counter()
+        fmap = folium.Map(location=[lat, lon], zoom_start=10)
+        folium.Marker([lat, lon], tooltip=label).add_to(fmap)
+        data = io.BytesIO()
+        fmap.save(data, close_file=False)
+        view.setHtml(data.getvalue().decode())
+        wait_for(view.loadFinished)
+        updates.append(time.perf_counter() - start)
+    view.close()
+    return updates
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locations", type=int, default=5, help=f"locations shown in turn (max {len(CITIES)})")
+    args, qt_args = parser.parse_known_args()
+
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1] + qt_args)  # noqa: F841
+    locations = []
+    for name in CITIES[:args.locations]:
+        result = mock_geocode(name)[0]
+        locations.append((float(result["lat"]), float(result["lon"]), name))
+
+    load, updates = time_bundled(locations)
+    print(f"bundled page  loadFinished         {ms(load)}")
+    print(f"              first showLocation   {ms(load + updates[0])}")
+    if len(updates) > 1:
+        print(f"              later (median)       {ms(statistics.median(updates[1:]))}")
+    try:
+        legacy = time_folium(locations)
+    except ImportError:
+        print("folium        not installed, skipped")
+        return
+    print(f"folium        first setHtml        {ms(legacy[0])}")
+    if len(legacy) > 1:
+        print(f"              later (median)       {ms(statistics.median(legacy[1:]))}")
+
+
+if __name__ == "__main__":
+    main()
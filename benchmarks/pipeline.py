@@ -0,0 +1,155 @@
+"""Time to first useful pixel: staged rendering vs. the previous all-at-once render.
+
+    python benchmarks/pipeline.py --searches 10 --latency 0.05
+
+Runs searches against the in-process mock server in two windows. One is the
+current ``WeatherWindow``, which paints the hourly list first and defers the
+daily/minutely lists and the chart. The other is ``SequentialWindow``, which
+fills everything and draws the chart synchronously before returning to the
+event loop, as ``render_weather`` used to. Each search reports the time until
+the hourly list is painted with the new rows, and the time until the chart
+has been drawn as well. Runs offscreen unless ``QT_QPA_PLATFORM`` says otherwise.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_CACHE_DIR = tempfile.mkdtemp(prefix="weather-pipeline-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.update(
+    WEATHER_PROVIDER="mock",
+    WEATHER_CACHE_DIR=_CACHE_DIR,
+    FORECAST_CACHE_PATH=os.path.join(_CACHE_DIR, "forecast.sqlite"),
+    GEOCODE_CACHE_PATH=os.path.join(_CACHE_DIR, "geocode.sqlite"),
+    HISTORY_PATH=os.path.join(_CACHE_DIR, "history.sqlite"),
+    WATCHLIST_PATH=os.path.join(_CACHE_DIR, "watchlist.json"),
+    GAZETTEER_PATH="",
+)
+
+from PyQt5.QtCore import QCoreApplication, QEvent, QEventLoop, QObject, Qt, QTimer  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from main import WeatherWindow  # noqa: E402
+from metrics import METRICS  # noqa: E402
+
+TIMEOUT_MS = 30000
+
+
+class SequentialWindow(WeatherWindow):
+    """``WeatherWindow`` with the single-pass ``render_weather`` it had before staged rendering."""
+
+    def render_weather(self, forecast, coords, location_name):
+        from rules import assess
+        self._render_id += 1
+        with METRICS.tracing(self._trace):
+            self.hourly_data = forecast.hourly
+            self.daily_data = forecast.daily
+            self.hourly_advice = assess(forecast.hourly.points).recommendations
+            self.daily_advice = assess(forecast.daily.points).recommendations
+            self.icons.prefetch(wp.icon for series in (forecast.hourly, forecast.daily) for wp in series)
+            self.hourly_model.set_series(forecast.hourly, forecast.hourly.day_headers)
+            self.daily_model.set_series(forecast.daily)
+            self.minutely_model.set_series(forecast.minutely)
+            self.update_map(coords["lat"], coords["lon"], location_name)
+            self.show_chart_range()
+            self.canvas.draw()
+            self.details_label.show_message("Selecciona una hora o día para ver los detalles")
+            self.show_loader(False)
+            self._search_started = None
+
+
+class PaintWatcher(QObject):
+    """Notes when the hourly list is first painted with rows in it, and when the chart is first drawn."""
+
+    def __init__(self, win: WeatherWindow):
+        super().__init__(win)
+        self.win = win
+        self.painted_at = None
+        self.drawn_at = None
+        win.hourly_list.viewport().installEventFilter(self)
+        self._draw_cid = win.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.painted_at is None and self.win.hourly_model.rowCount():
+            self.painted_at = time.perf_counter()
+        return False
+
+    def _on_draw(self, _event):
+        if self.drawn_at is None:
+            self.drawn_at = time.perf_counter()
+
+    def done(self) -> bool:
+        return self.painted_at is not None and self.drawn_at is not None
+
+    def close(self):
+        self.win.hourly_list.viewport().removeEventFilter(self)
+        self.win.canvas.mpl_disconnect(self._draw_cid)
+        self.deleteLater()
+
+
+def run_until(predicate):
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: predicate() and loop.quit())
+    poll.start(1)
+    QTimer.singleShot(TIMEOUT_MS, loop.quit)
+    loop.exec_()
+    poll.stop()
+    if not predicate():
+        raise TimeoutError("search did not finish")
+
+
+def new_window(cls):
+    win = cls()
+    win.show()
+    run_until(lambda: win.chart is not None)
+    return win
+
+
+def search(win: WeatherWindow, name: str):
+    """Seconds until the hourly list is painted with rows, and until the chart is drawn as well."""
+    win.hourly_model.set_series(type(win.hourly_data)(), [])
+    QApplication.processEvents()
+    watcher = PaintWatcher(win)
+    win.location_input.setText(name)
+    start = time.perf_counter()
+    win.handle_location_search()
+    run_until(watcher.done)
+    watcher.close()
+    return watcher.painted_at - start, max(watcher.painted_at, watcher.drawn_at) - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=10, help="searches per window")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server latency in seconds")
+    args, qt_args = parser.parse_known_args()
+    # Read when the mock server starts, on the first search.
+    os.environ["MOCK_LATENCY"] = str(args.latency)
+
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1] + qt_args)  # noqa: F841
+    results = {}
+    for label, cls in (("pipelined", WeatherWindow), ("sequential", SequentialWindow)):
+        win = new_window(cls)
+        # One warm-up search pays for fonts, numpy and the HTTP session.
+        search(win, f"{label} warm-up")
+        # Different place names per window, so neither is served from the other's forecast cache.
+        results[label] = [search(win, f"{label} {i}") for i in range(args.searches)]
+        win.close()
+        win.icons.thread_pool.clear()
+        win.icons.thread_pool.waitForDone()
+
+    print(f"{args.searches} searches per window, mock latency {args.latency * 1000:.0f} ms (median)")
+    for label, timings in results.items():
+        first_pixel = statistics.median(t[0] for t in timings) * 1000
+        complete = statistics.median(t[1] for t in timings) * 1000
+        print(f"{label:<11} first useful pixel {first_pixel:8.1f} ms   full render {complete:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Recommendation rules over many forecasts: ``rules.assess`` vs. a per-point loop.
+
+    python benchmarks/rules_batch.py --forecasts 500
+
+Forecasts are ``mock_server.mock_forecast`` payloads for different places,
+parsed once up front. ``scalar_assess`` evaluates the same rules and derived
+metrics one point at a time, the way the details panel used to do on every
+selection. Its messages are checked against ``assess`` before timing.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forecast_parser import parse_forecast  # noqa: E402
+from mock_server import mock_forecast  # noqa: E402
+from rules import (  # noqa: E402
+    DEFAULT_THRESHOLDS, PLEASANT_MESSAGE, RAIN_MESSAGES, RAIN_LOW, RAIN_MEDIUM, RAIN_NONE, RAIN_VERY_HIGH,
+    RAIN_VERY_LOW, RULE_MESSAGES, Thresholds, assess,
+)
+
+
+def scalar_heat_index(temp_c: float, humidity: float) -> float:
+    t = temp_c * 9 / 5 + 32
+    rh = humidity
+    if not (t >= 80 and rh >= 40):
+        return temp_c
+    hi = (-42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh - 6.83783e-3 * t * t
+          - 5.481717e-2 * rh * rh + 1.22874e-3 * t * t * rh + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh)
+    return (hi - 32) * 5 / 9
+
+
+def scalar_wind_chill(temp_c: float, wind_ms) -> float:
+    kmh = (wind_ms or 0.0) * 3.6
+    if not (temp_c <= 10 and kmh > 4.8):
+        return temp_c
+    v = kmh ** 0.16
+    return 13.12 + 0.6215 * temp_c - 11.37 * v + 0.3965 * temp_c * v
+
+
+def scalar_assess(points, thresholds: Thresholds = DEFAULT_THRESHOLDS):
+    recommendations = []
+    for i, wp in enumerate(points):
+        pop = wp.pop
+        upcoming = [p.pop for p in points[i:i + thresholds.rain_window] if p.pop is not None]
+        upcoming_pop = max(upcoming) if upcoming else None
+        hi = scalar_heat_index(wp.temp, wp.humidity)
+        wc = scalar_wind_chill(wp.temp, wp.wind_speed)
+        spread = None if wp.dew_point is None else wp.temp - wp.dew_point
+
+        if pop is None:
+            rain = RAIN_NONE
+        elif pop >= thresholds.rain_very_high:
+            rain = RAIN_VERY_HIGH
+        elif pop >= thresholds.rain_medium:
+            rain = RAIN_MEDIUM
+        elif pop >= thresholds.rain_low:
+            rain = RAIN_LOW
+        else:
+            rain = RAIN_VERY_LOW
+        matched = (
+            wp.uvi is not None and wp.uvi >= thresholds.uv_high,
+            wp.temp >= thresholds.heat,
+            wp.temp <= thresholds.cold,
+            wp.humidity >= thresholds.humidity_high,
+            upcoming_pop is not None and pop is not None
+            and upcoming_pop >= thresholds.rain_medium and pop < thresholds.rain_low,
+            spread is not None and spread <= thresholds.fog_spread,
+            hi >= thresholds.heat and wp.temp < thresholds.heat,
+            wc <= thresholds.cold and wp.temp > thresholds.cold,
+        )
+        rules = [message for message, hit in zip(RULE_MESSAGES, matched) if hit]
+        recommendations.append((RAIN_MESSAGES[rain], *(rules or [PLEASANT_MESSAGE])))
+    return recommendations
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--forecasts", type=int, default=500, help="number of parsed forecasts")
+    parser.add_argument("--hours", type=int, default=48, help="hourly points per forecast")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant; the fastest is reported")
+    args = parser.parse_args()
+
+    series = [
+        parse_forecast(mock_forecast(-60 + 130 * i / args.forecasts, math.fmod(i * 37.0, 360) - 180),
+                       hours=args.hours).hourly.points
+        for i in range(args.forecasts)
+    ]
+    for points in series:
+        assert assess(points).recommendations == scalar_assess(points), "scalar loop disagrees with assess"
+
+    total = sum(len(points) for points in series)
+    vectorized = best_of(args.repeat, lambda: [assess(points) for points in series])
+    scalar = best_of(args.repeat, lambda: [scalar_assess(points) for points in series])
+    print(f"{args.forecasts} forecasts, {total} points")
+    print(f"rules.assess   {vectorized * 1000:9.1f} ms  {vectorized / args.forecasts * 1e6:8.1f} µs/forecast")
+    print(f"per-point loop {scalar * 1000:9.1f} ms  {scalar / args.forecasts * 1e6:8.1f} µs/forecast")
+    print(f"speedup: {scalar / vectorized:.1f}x")
+
+    # The same points as one long series: NumPy's fixed per-call cost is paid once.
+    joined = [wp for points in series for wp in points]
+    vectorized = best_of(args.repeat, lambda: assess(joined))
+    scalar = best_of(args.repeat, lambda: scalar_assess(joined))
+    print(f"as one series of {total} points")
+    print(f"rules.assess   {vectorized * 1000:9.1f} ms")
+    print(f"per-point loop {scalar * 1000:9.1f} ms")
+    print(f"speedup: {scalar / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
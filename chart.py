@@ -0,0 +1,119 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from matplotlib.figure import Figure
+
+BACKGROUND = "#F5F9FF"
+LINE_COLOR = "#4A90E2"
+FILL_COLOR = "#A1C4FD"
+TEXT_COLOR = "#2C3E50"
+GRID_COLOR = "#B0C4DE"
+MAX_ANNOTATED_POINTS = 12
+MAX_TICK_LABELS = 10
+
+
+class TemperatureChart:
+    """Temperature line chart that keeps its artists between updates.
+
+    ``set_data`` only touches the figure when the dataset actually changes,
+    and then just updates the existing line, annotations and ticks; the
+    redraw is left to the event loop (``draw_idle``) so it never delays
+    widgets updated in the same turn. ``highlight`` moves the selection
+    marker with blitting, redrawing only the marker over a cached background
+    instead of the whole canvas.
+    """
+
+    def __init__(self, figure: Figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self._key = None
+        self._temps = np.empty(0)
+        self._background = None
+        self._highlighted: Optional[int] = None
+
+        figure.set_facecolor(BACKGROUND)
+        ax = self.ax = figure.add_subplot(111)
+        ax.set_facecolor(BACKGROUND)
+        ax.set_ylabel("Temperatura (°C)", color=TEXT_COLOR, fontsize=12)
+        ax.tick_params(axis='x', colors=TEXT_COLOR, labelsize=10)
+        ax.tick_params(axis='y', colors=TEXT_COLOR, labelsize=10)
+        ax.grid(True, alpha=0.25, color=GRID_COLOR, linestyle='--', zorder=1)
+        for spine in ax.spines.values():
+            spine.set_color(GRID_COLOR)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+
+        self._title = ax.set_title("", color=TEXT_COLOR, fontsize=15, fontweight="bold", pad=15)
+        self._line, = ax.plot([], [], color=LINE_COLOR, marker="o", markerfacecolor=FILL_COLOR,
+                              markeredgecolor=TEXT_COLOR, linewidth=2, zorder=3)
+        self._marker, = ax.plot([], [], linestyle="none", marker="o", markersize=12, markerfacecolor=LINE_COLOR,
+                                markeredgecolor=TEXT_COLOR, markeredgewidth=2, zorder=5, animated=True)
+        self._fill = None
+        self._annotations = [
+            ax.text(0, 0, "", ha="center", va="bottom", fontsize=10, color=TEXT_COLOR,
+                    fontweight="bold", zorder=4, visible=False)
+            for _ in range(MAX_ANNOTATED_POINTS)
+        ]
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_data(self, temps: Sequence[float], labels: Sequence[str], title: str, xlabel: str):
+        """Show ``temps``; a no-op when the same dataset is already displayed."""
+        key = (title, tuple(temps), tuple(labels))
+        if key == self._key or not len(temps):
+            return
+        self._key = key
+        self._highlighted = None
+        self._marker.set_data([], [])
+        ax = self.ax
+        y = self._temps = np.asarray(temps, dtype=float)
+        x = np.arange(len(y))
+
+        self._line.set_data(x, y)
+        if self._fill is not None:
+            self._fill.remove()
+        self._fill = ax.fill_between(x, y, y.min() - 2, color=FILL_COLOR, alpha=0.25, zorder=2)
+        annotate = len(y) <= MAX_ANNOTATED_POINTS
+        for i, text in enumerate(self._annotations):
+            if annotate and i < len(y):
+                text.set_position((i, y[i] + 0.5))
+                text.set_text(f"{y[i]:.1f}°")
+                text.set_visible(True)
+            else:
+                text.set_visible(False)
+
+        max_labels = min(MAX_TICK_LABELS, len(y))
+        step = max(1, len(y) // max_labels)
+        shown_labels = [label if (i % step == 0 or i == len(y) - 1) else "" for i, label in enumerate(labels)]
+        ax.set_xticks(x)
+        ax.set_xticklabels(shown_labels, rotation=35, ha="right", fontsize=9)
+        self._title.set_text(title)
+        ax.set_xlabel(xlabel, color=TEXT_COLOR, fontsize=12)
+        ax.relim()
+        ax.autoscale_view()
+        self.figure.tight_layout(pad=2.0)
+        # The cached background shows the old data; highlight() redraws fully until the next draw event.
+        self._background = None
+        self.canvas.draw_idle()
+
+    def highlight(self, index: Optional[int]):
+        """Mark point ``index`` (``None`` clears the marker) using blitting."""
+        if index == self._highlighted:
+            return
+        self._highlighted = index
+        if index is None or not 0 <= index < len(self._temps):
+            self._marker.set_data([], [])
+        else:
+            self._marker.set_data([index], [self._temps[index]])
+        self._blit()
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.ax.draw_artist(self._marker)
+
+    def _blit(self):
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self._marker)
+        self.canvas.blit(self.figure.bbox)
@@ -0,0 +1,169 @@
+import time
+from typing import Dict, Optional, Set
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QHBoxLayout, QHeaderView, QPushButton, QTableView, QVBoxLayout, QWidget
+
+from forecast_parser import Forecast, parse_forecast
+from watchlist import LocationSummary, RefreshScheduler, Watchlist, WatchedLocation, summarize
+from weather_api import FORECAST_CACHE, FORECAST_DAYS, FORECAST_HOURS, LANG, UNITS, fetch_forecast
+from workers import Worker
+
+TICK_MS = 15 * 1000
+# After a failed refresh, wait this long before trying the location again.
+RETRY_DELAY = 60
+COLUMNS = ("Ubicación", "Clima", "Temp.", "Lluvia", "Actualizado")
+
+
+class WatchlistModel(QAbstractTableModel):
+    """One row per watched location; refreshed rows emit ``dataChanged`` for that row only."""
+
+    def __init__(self, watchlist: Watchlist, parent=None):
+        super().__init__(parent)
+        self.watchlist = watchlist
+        self.summaries: Dict[str, LocationSummary] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.watchlist.locations)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        location = self.watchlist.locations[index.row()]
+        column = index.column()
+        if column == 0:
+            return location.name
+        summary = self.summaries.get(location.key)
+        if summary is None:
+            return "…"
+        if column == 1:
+            return f"{summary.emoji} {summary.description}"
+        if column == 2:
+            return f"{summary.temp:.1f}°C"
+        if column == 3:
+            return "-" if summary.max_pop is None else f"{summary.max_pop:.0%}"
+        return time.strftime("%H:%M", time.localtime(summary.fetched_at))
+
+    def add(self, location: WatchedLocation) -> bool:
+        if any(existing.key == location.key for existing in self.watchlist.locations):
+            return False
+        row = len(self.watchlist.locations)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.watchlist.add(location)
+        self.endInsertRows()
+        return True
+
+    def remove(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        location = self.watchlist.locations[row]
+        self.watchlist.remove(row)
+        self.summaries.pop(location.key, None)
+        self.endRemoveRows()
+
+    def update_summary(self, key: str, summary: LocationSummary):
+        self.summaries[key] = summary
+        for row, location in enumerate(self.watchlist.locations):
+            if location.key == key:
+                self.dataChanged.emit(self.index(row, 1), self.index(row, len(COLUMNS) - 1))
+                return
+
+
+class WatchlistPanel(QWidget):
+    """Watchlist table that refreshes its locations in the background.
+
+    Every ``TICK_MS`` the scheduler picks the few locations whose data has
+    aged past the provider's update interval. Fresh cache entries are used
+    directly; the rest are fetched on the thread pool, so the GUI thread never
+    waits on the network.
+    """
+
+    location_activated = pyqtSignal(object, object)  # WatchedLocation, Forecast
+
+    def __init__(self, watchlist: Watchlist, thread_pool: Optional[QThreadPool] = None, parent=None):
+        super().__init__(parent)
+        self.model = WatchlistModel(watchlist, self)
+        self.scheduler = RefreshScheduler(interval=FORECAST_CACHE.ttl)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._fetched_at: Dict[str, float] = {}
+        self._forecasts: Dict[str, Forecast] = {}
+        self._in_flight: Set[str] = set()
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self._on_activated)
+        remove_button = QPushButton("Quitar")
+        remove_button.clicked.connect(self.remove_selected)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(remove_button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(TICK_MS)
+        QTimer.singleShot(0, self.tick)
+
+    def add_location(self, location: WatchedLocation):
+        if self.model.add(location):
+            self.tick()
+
+    def remove_selected(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()}, reverse=True)
+        for row in rows:
+            key = self.model.watchlist.locations[row].key
+            self._fetched_at.pop(key, None)
+            self._forecasts.pop(key, None)
+            self.model.remove(row)
+
+    def tick(self):
+        locations = {location.key: location for location in self.model.watchlist.locations}
+        now = time.time()
+        for key in self.scheduler.due(self._fetched_at, list(locations), now, self._in_flight):
+            location = locations[key]
+            cached = FORECAST_CACHE.peek(location.lat, location.lon, UNITS, LANG)
+            if cached is not None and cached.fresh:
+                self._store(key, parse_forecast(cached.data, FORECAST_HOURS, FORECAST_DAYS), cached.fetched_at)
+                continue
+            self._in_flight.add(key)
+            worker = Worker(fetch_forecast, {"lat": location.lat, "lon": location.lon})
+            worker.signals.result.connect(lambda forecast, key=key: self._store(key, forecast, time.time()))
+            worker.signals.error.connect(lambda _message, key=key: self._on_refresh_failed(key))
+            worker.signals.finished.connect(lambda key=key: self._in_flight.discard(key))
+            self.thread_pool.start(worker)
+
+    def _is_watched(self, key: str) -> bool:
+        return any(location.key == key for location in self.model.watchlist.locations)
+
+    def _on_refresh_failed(self, key: str):
+        if self._is_watched(key):
+            self._fetched_at[key] = time.time() - self.scheduler.interval + RETRY_DELAY
+
+    def _store(self, key: str, forecast: Forecast, fetched_at: float):
+        # Refreshes still in flight when their location was removed are dropped.
+        if not self._is_watched(key):
+            return
+        self._fetched_at[key] = fetched_at
+        self._forecasts[key] = forecast
+        summary = summarize(forecast, fetched_at)
+        if summary is not None:
+            self.model.update_summary(key, summary)
+
+    def _on_activated(self, index: QModelIndex):
+        location = self.model.watchlist.locations[index.row()]
+        forecast = self._forecasts.get(location.key)
+        if forecast is not None:
+            self.location_activated.emit(location, forecast)
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from functools import lru_cache
+from string import Template
+from typing import Sequence, Tuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextDocument, QTextOption
+from PyQt5.QtWidgets import QFrame, QTextBrowser
+
+from forecast_parser import WeatherPoint, emoji_for
+
+# Documents kept parsed; enough for both forecast tabs of a location and a few more.
+MAX_DOCUMENTS = 128
+
+DETAILS_TEMPLATE = Template('''
+<div style="display: flex; align-items: center; gap: 18px;">
+    <span style="font-size: 4.5em; width:90px; height:90px; display: flex; align-items: center; justify-content: center; background: #EAF1FB; border-radius: 18px; box-shadow: 0 2px 8px #A1C4FD55;">$emoji</span>
+    <div style="flex:1;">
+        <div style="font-size: 1.5em; font-weight: bold; color: #2C3E50; margin-bottom: 2px;">$dt_txt</div>
+        <div style="font-size: 1.2em; color: #4A90E2; font-weight: bold;">$weather</div>
+        <div style="margin-top: 8px;">
+            <span style="font-size: 1.1em; color: #2C3E50;">🌡️ $temp °C</span> &nbsp;
+            <span style="color: #7B8FA1;">Sensación: $feels_like °C</span>
+        </div>
+        <div style="margin-top: 4px; color: #2C3E50;">
+            💧 $humidity% &nbsp; | &nbsp; ⬇️ $pressure hPa
+        </div>
+        <div style="margin-top: 4px; color: #2C3E50;">
+            ☁️ Nubes: $clouds% &nbsp; | &nbsp; 🧊 Punto de rocío: $dew_point°C &nbsp; | &nbsp; ☀️ UV: $uvi
+        </div>
+        <div style="margin-top: 10px; font-size: 1.1em; color: #4A90E2; font-weight: bold;">
+            $recommendations
+        </div>
+    </div>
+</div>
+''')
+
+
+def _optional(value) -> str:
+    return "-" if value is None else str(value)
+
+
+@lru_cache(maxsize=MAX_DOCUMENTS)
+def render_details(wp: WeatherPoint, recommendations: Tuple[str, ...]) -> str:
+    return DETAILS_TEMPLATE.substitute(
+        emoji=emoji_for(wp.icon),
+        dt_txt=wp.dt_txt,
+        weather=wp.weather.capitalize(),
+        temp=wp.temp,
+        feels_like=wp.feels_like,
+        humidity=wp.humidity,
+        pressure=wp.pressure,
+        clouds=_optional(wp.clouds),
+        dew_point=_optional(wp.dew_point),
+        uvi=_optional(wp.uvi),
+        recommendations="<br>".join(recommendations),
+    )
+
+
+class DetailsView(QTextBrowser):
+    """Read-only details panel that keeps a parsed ``QTextDocument`` per entry.
+
+    Revisiting an entry swaps its document back in, so there is no string
+    building and no rich-text parsing; only new entries are rendered.
+    """
+
+    def __init__(self, message: str = "", parent=None):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setOpenLinks(False)
+        self.setTextInteractionFlags(Qt.NoTextInteraction)
+        self._documents: "OrderedDict[tuple, QTextDocument]" = OrderedDict()
+        self._message = self._new_document()
+        self.show_message(message)
+
+    def _new_document(self) -> QTextDocument:
+        document = QTextDocument(self)
+        document.setDefaultFont(self.font())
+        option = QTextOption(Qt.AlignCenter)
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        document.setDefaultTextOption(option)
+        return document
+
+    def show_message(self, text: str):
+        self._message.setDefaultFont(self.font())
+        self._message.setPlainText(text)
+        self.setDocument(self._message)
+
+    def show_point(self, wp: WeatherPoint, recommendations: Sequence[str]):
+        key = (wp, tuple(recommendations))
+        document = self._documents.get(key)
+        if document is None:
+            document = self._new_document()
+            document.setHtml(render_details(*key))
+            self._documents[key] = document
+            if len(self._documents) > MAX_DOCUMENTS:
+                self._documents.popitem(last=False)[1].deleteLater()
+        else:
+            self._documents.move_to_end(key)
+        self.setDocument(document)
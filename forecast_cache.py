@@ -0,0 +1,130 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# OpenWeather refreshes One Call data roughly every 10 minutes.
+DEFAULT_TTL = 10 * 60
+# How long an expired entry may still be shown while a refresh runs.
+DEFAULT_STALE_TTL = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_PRECISION = 2
+
+
+@dataclass
+class CacheEntry:
+    data: dict
+    fetched_at: float
+    fresh: bool
+
+
+class ForecastCache:
+    """SQLite-backed cache of decoded One Call responses.
+
+    Entries are keyed by coordinates rounded to ``precision`` decimals plus the
+    ``units`` and ``lang`` request parameters. An entry is *fresh* for ``ttl``
+    seconds and *stale* for a further ``stale_ttl`` seconds, during which it can
+    still be rendered while a background refresh replaces it. The table is
+    capped at ``max_entries`` rows, evicting the least recently used ones.
+
+    Reads never write: access times are kept in memory and saved by the next
+    ``put``, which is the only place that evicts. ``get`` is therefore a
+    single ``SELECT`` and is cheap enough to call from the GUI thread.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, stale_ttl: float = DEFAULT_STALE_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, precision: int = DEFAULT_PRECISION):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.precision = precision
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        # key -> last access time not yet written to accessed_at.
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL commits don't fsync the main file; NORMAL is still safe against corruption.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS forecasts ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS forecasts_accessed ON forecasts (accessed_at)")
+        self._conn.commit()
+
+    def make_key(self, lat: float, lon: float, units: str, lang: str) -> str:
+        return f"{round(lat, self.precision):.{self.precision}f},{round(lon, self.precision):.{self.precision}f},{units},{lang}"
+
+    def _lookup(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        row = self._conn.execute("SELECT data, fetched_at FROM forecasts WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl + self.stale_ttl:
+            return None
+        return row
+
+    def get(self, lat: float, lon: float, units: str, lang: str) -> Optional[CacheEntry]:
+        """Look up an entry for a search, counting it in ``stats`` and as a recent use."""
+        key = self.make_key(lat, lon, units, lang)
+        now = time.time()
+        with self._lock:
+            row = self._lookup(key, now)
+            if row is None:
+                self.misses += 1
+                return None
+            self._touched[key] = now
+            fresh = now - row[1] <= self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return CacheEntry(json.loads(row[0]), row[1], fresh)
+
+    def peek(self, lat: float, lon: float, units: str, lang: str) -> Optional[CacheEntry]:
+        """Like ``get``, but for background checks: neither counted nor marked as used."""
+        key = self.make_key(lat, lon, units, lang)
+        now = time.time()
+        with self._lock:
+            row = self._lookup(key, now)
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], now - row[1] <= self.ttl)
+
+    def put(self, lat: float, lon: float, units: str, lang: str, data: dict):
+        key = self.make_key(lat, lon, units, lang)
+        payload = json.dumps(data, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._conn.executemany("UPDATE forecasts SET accessed_at = ? WHERE key = ?",
+                                   [(at, touched_key) for touched_key, at in touched.items()])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO forecasts (key, data, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM forecasts WHERE key IN ("
+                " SELECT key FROM forecasts ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM forecasts")
+            self._conn.commit()
+
+    def stats(self) -> Tuple[int, int, int]:
+        """Return ``(hits, stale_hits, misses)`` since the cache was opened."""
+        return self.hits, self.stale_hits, self.misses
@@ -0,0 +1,90 @@
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+HEADER_COLOR = Qt.darkBlue
+
+
+class ForecastListModel(QAbstractListModel):
+    """Read-only list model over a parsed forecast series.
+
+    Optional day headers are interleaved as non-selectable rows; a row table
+    maps each row to its point index (``-1`` for headers) so lookups stay O(1)
+    however many rows there are. Text is formatted lazily, only for rows the
+    view actually paints.
+    """
+
+    PointIndexRole = Qt.UserRole + 1
+    IsHeaderRole = Qt.UserRole + 2
+
+    def __init__(self, formatter: Callable[[object], str], parent=None):
+        super().__init__(parent)
+        self._formatter = formatter
+        self._series: Sequence = ()
+        self._rows: Optional[array] = None
+        self._headers: List[str] = []
+
+    def set_series(self, series: Sequence, headers: Optional[Dict[int, str]] = None):
+        self.beginResetModel()
+        self._series = series
+        self._headers = []
+        if headers:
+            rows = array("l")
+            for index in range(len(series)):
+                if index in headers:
+                    self._headers.append(headers[index])
+                    rows.append(-len(self._headers))
+                rows.append(index)
+            self._rows = rows
+        else:
+            self._rows = None
+        self.endResetModel()
+
+    def point_index(self, row: int) -> int:
+        """Index into the series for ``row``, or ``-1`` for header and invalid rows."""
+        if self._rows is None:
+            return row if 0 <= row < len(self._series) else -1
+        if not 0 <= row < len(self._rows):
+            return -1
+        return max(self._rows[row], -1)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows) if self._rows is not None else len(self._series)
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid() or (self._rows is not None and self._rows[index.row()] < 0):
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        value = self._rows[row] if self._rows is not None else row
+        if role == Qt.DisplayRole:
+            if value < 0:
+                return self._headers[-value - 1]
+            return self._formatter(self._series[value])
+        if role == self.IsHeaderRole:
+            return value < 0
+        if role == self.PointIndexRole:
+            return max(value, -1)
+        return None
+
+
+class ForecastItemDelegate(QStyledItemDelegate):
+    """Paints day headers as centered captions and leaves regular rows to the style sheet."""
+
+    def paint(self, painter, option: QStyleOptionViewItem, index: QModelIndex):
+        if not index.data(ForecastListModel.IsHeaderRole):
+            super().paint(painter, option, index)
+            return
+        painter.save()
+        painter.setPen(HEADER_COLOR)
+        painter.setFont(option.font)
+        painter.drawText(option.rect, Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
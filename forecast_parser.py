@@ -0,0 +1,192 @@
+"""Single-pass decoding of One Call responses into ``WeatherPoint`` series.
+
+Has no Qt dependency so it can run in worker threads and batch jobs. Labels
+come from lookup tables built once at import time, and each entry calls
+``datetime.fromtimestamp`` exactly once.
+"""
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+WEATHER_EMOJIS = {
+    "01d": "☀️", "01n": "🌙",
+    "02d": "🌤️", "02n": "🌤️",
+    "03d": "☁️", "03n": "☁️",
+    "04d": "☁️", "04n": "☁️",
+    "09d": "🌧️", "09n": "🌧️",
+    "10d": "🌦️", "10n": "🌦️",
+    "11d": "⛈️", "11n": "⛈️",
+    "13d": "❄️", "13n": "❄️",
+    "50d": "🌫️", "50n": "🌫️",
+}
+UNKNOWN_EMOJI = "❓"
+DAYS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+DAYS_SHORT = ("Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom")
+MONTHS = ("ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic")
+# Index by hour of day: ("12", "AM"), ("1", "AM"), ..., ("11", "PM").
+HOUR_LABELS = tuple((str(h % 12 or 12), "AM" if h < 12 else "PM") for h in range(24))
+MINUTE_LABELS = tuple(f"{m:02d}" for m in range(60))
+
+_NO_WEATHER = ({},)
+_NO_TEMP: Dict[str, float] = {}
+
+
+class WeatherPoint(NamedTuple):
+    dt_txt: str
+    temp: float
+    feels_like: float
+    humidity: int
+    pressure: int
+    weather: str
+    icon: str
+    clouds: Optional[int] = None
+    dew_point: Optional[float] = None
+    uvi: Optional[float] = None
+    pop: Optional[float] = None
+    dt: int = 0
+    wind_speed: Optional[float] = None
+
+
+class ForecastSeries:
+    """Ordered ``WeatherPoint``s plus columnar ``dt``/``temp`` arrays.
+
+    ``day_headers`` maps the index of the first point of each calendar day to
+    its label (filled for hourly series only).
+    """
+    __slots__ = ("points", "dt", "temp", "day_headers")
+
+    def __init__(self):
+        self.points: List[WeatherPoint] = []
+        self.dt = array("q")
+        self.temp = array("d")
+        self.day_headers: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, index: int) -> WeatherPoint:
+        return self.points[index]
+
+    def __iter__(self) -> Iterator[WeatherPoint]:
+        return iter(self.points)
+
+
+class MinutelySeries:
+    """Minute-by-minute precipitation (mm/h) as columnar arrays plus display labels."""
+    __slots__ = ("dt", "precipitation", "labels")
+
+    def __init__(self):
+        self.dt = array("q")
+        self.precipitation = array("d")
+        self.labels: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.dt)
+
+    def __getitem__(self, index: int):
+        return self.labels[index], self.precipitation[index]
+
+
+class Forecast(NamedTuple):
+    hourly: ForecastSeries
+    daily: ForecastSeries
+    minutely: MinutelySeries = MinutelySeries()
+
+
+def emoji_for(icon: str) -> str:
+    return WEATHER_EMOJIS.get(icon, UNKNOWN_EMOJI)
+
+
+def unix_to_hour(ts: int) -> str:
+    dt = datetime.fromtimestamp(ts)
+    hour, period = HOUR_LABELS[dt.hour]
+    return f"{hour}:{MINUTE_LABELS[dt.minute]} {period}"
+
+
+def format_day(ts: int, short: bool = False) -> str:
+    dt = datetime.fromtimestamp(ts)
+    weekday = (DAYS_SHORT if short else DAYS)[dt.weekday()]
+    return f"{weekday}, {dt.day:02d} {MONTHS[dt.month - 1]}"
+
+
+def parse_hourly(entries: list) -> ForecastSeries:
+    series = ForecastSeries()
+    points, dts, temps, headers = series.points, series.dt, series.temp, series.day_headers
+    last_day = None
+    for index, hour in enumerate(entries):
+        ts = hour.get("dt", 0)
+        local = datetime.fromtimestamp(ts)
+        day = (local.year, local.month, local.day)
+        if day != last_day:
+            headers[index] = f"{DAYS[local.weekday()]}, {local.day:02d} {MONTHS[local.month - 1]}"
+            last_day = day
+        hour_label, period = HOUR_LABELS[local.hour]
+        weather = (hour.get("weather") or _NO_WEATHER)[0]
+        temp = hour.get("temp", 0.0)
+        points.append(WeatherPoint(
+            f"{hour_label}:{MINUTE_LABELS[local.minute]} {period}",
+            temp,
+            hour.get("feels_like", 0.0),
+            hour.get("humidity", 0),
+            hour.get("pressure", 0),
+            weather.get("description", ""),
+            weather.get("icon", "01d"),
+            hour.get("clouds"),
+            hour.get("dew_point"),
+            hour.get("uvi"),
+            hour.get("pop"),
+            ts,
+            hour.get("wind_speed"),
+        ))
+        dts.append(ts)
+        temps.append(temp)
+    return series
+
+
+def parse_daily(entries: list) -> ForecastSeries:
+    series = ForecastSeries()
+    points, dts, temps = series.points, series.dt, series.temp
+    for day in entries:
+        ts = day.get("dt", 0)
+        local = datetime.fromtimestamp(ts)
+        weather = (day.get("weather") or _NO_WEATHER)[0]
+        temp = day.get("temp", _NO_TEMP).get("day", 0.0)
+        points.append(WeatherPoint(
+            f"{DAYS_SHORT[local.weekday()]}, {local.day:02d} {MONTHS[local.month - 1]}",
+            temp,
+            day.get("feels_like", _NO_TEMP).get("day", 0.0),
+            day.get("humidity", 0),
+            day.get("pressure", 0),
+            weather.get("description", ""),
+            weather.get("icon", "01d"),
+            day.get("clouds"),
+            day.get("dew_point"),
+            day.get("uvi"),
+            day.get("pop"),
+            ts,
+            day.get("wind_speed"),
+        ))
+        dts.append(ts)
+        temps.append(temp)
+    return series
+
+
+def parse_minutely(entries: list) -> MinutelySeries:
+    series = MinutelySeries()
+    dts, precipitation, labels = series.dt, series.precipitation, series.labels
+    for minute in entries:
+        ts = minute.get("dt", 0)
+        local = datetime.fromtimestamp(ts)
+        hour_label, period = HOUR_LABELS[local.hour]
+        dts.append(ts)
+        precipitation.append(minute.get("precipitation", 0.0))
+        labels.append(f"{hour_label}:{MINUTE_LABELS[local.minute]} {period}")
+    return series
+
+
+def parse_forecast(data: dict, hours: int = 24, days: int = 7) -> Forecast:
+    return Forecast(
+        parse_hourly(data.get("hourly", [])[:hours]),
+        parse_daily(data.get("daily", [])[:days]),
+        parse_minutely(data.get("minutely", [])),
+    )
@@ -0,0 +1,244 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from metrics import METRICS
+
+if TYPE_CHECKING:
+    from providers import GeocodingProvider
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+# Nominatim usage policy: at most one request per second.
+NOMINATIM_MIN_INTERVAL = 1.0
+DEFAULT_MAX_ENTRIES = 2000
+# Index keys examined per gazetteer prefix search before ranking by population.
+MAX_PREFIX_SCAN = 200
+
+_SPACES = re.compile(r"\s+")
+_SEPARATORS = re.compile(r"\s*,\s*")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, accents and spacing so equivalent queries share a cache key."""
+    text = unicodedata.normalize("NFKD", query.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _SEPARATORS.sub(", ", _SPACES.sub(" ", text).strip(" ,"))
+    return text
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least ``min_interval`` seconds apart."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Suggestion(NamedTuple):
+    label: str
+    lat: float
+    lon: float
+
+
+class GeocodeCache:
+    """SQLite cache of resolved queries, capped at ``max_entries`` (LRU)."""
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS places ("
+            " query TEXT PRIMARY KEY,"
+            " lat REAL NOT NULL,"
+            " lon REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " label TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(places)")}
+        if "label" not in columns:
+            # Caches written before labels were stored; their rows fall back to the normalized query.
+            self._conn.execute("ALTER TABLE places ADD COLUMN label TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS places_accessed ON places (accessed_at)")
+        self._conn.commit()
+
+    def get(self, query: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            row = self._conn.execute("SELECT lat, lon FROM places WHERE query = ?", (query,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE places SET accessed_at = ? WHERE query = ?", (time.time(), query))
+            self._conn.commit()
+            self.hits += 1
+        return {"lat": row[0], "lon": row[1]}
+
+    def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        """Cached places whose normalized query starts with ``prefix``, most recently used first.
+
+        Each is labelled with the text it was first searched as.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT COALESCE(label, query), lat, lon FROM places WHERE query >= ? AND query < ?"
+                " ORDER BY accessed_at DESC LIMIT ?",
+                (prefix, prefix + "\U0010ffff", limit),
+            ).fetchall()
+        return [Suggestion(*row) for row in rows]
+
+    def put(self, query: str, coords: Dict[str, float], label: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (query, lat, lon, accessed_at, label) VALUES (?, ?, ?, ?, ?)",
+                (query, coords["lat"], coords["lon"], time.time(), label),
+            )
+            self._conn.execute(
+                "DELETE FROM places WHERE query IN ("
+                " SELECT query FROM places ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+
+class Gazetteer:
+    """In-memory city index loaded from a GeoNames ``citiesNNNN.txt`` dump.
+
+    Coordinates live in two ``array('d')`` columns and names map to row
+    indices, so a lookup is a single dict probe. When several cities share a
+    name the most populated one wins; ``"name, cc"`` picks a country. Prefix
+    searches bisect a sorted copy of the keys, built on first use.
+    """
+
+    def __init__(self):
+        self.lat = array("d")
+        self.lon = array("d")
+        self.names: List[str] = []
+        self._population = array("q")
+        self._index: Dict[str, int] = {}
+        self._sorted_keys: Optional[List[str]] = None
+
+    @classmethod
+    def from_geonames(cls, path: str) -> "Gazetteer":
+        gazetteer = cls()
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                cols = line.rstrip("\n").split("\t")
+                if len(cols) < 15:
+                    continue
+                row = len(gazetteer.lat)
+                gazetteer.lat.append(float(cols[4]))
+                gazetteer.lon.append(float(cols[5]))
+                gazetteer._population.append(int(cols[14] or 0))
+                gazetteer.names.append(f"{cols[1]}, {cols[8]}")
+                country = cols[8].casefold()
+                for name in {normalize_query(cols[1]), normalize_query(cols[2])}:
+                    gazetteer._add(name, row)
+                    gazetteer._add(f"{name}, {country}", row)
+        return gazetteer
+
+    def _add(self, key: str, row: int):
+        current = self._index.get(key)
+        if current is None or self._population[row] > self._population[current]:
+            self._index[key] = row
+
+    def lookup(self, query: str) -> Optional[Dict[str, float]]:
+        """Resolve an already normalized query, or return ``None``."""
+        row = self._index.get(query)
+        if row is None:
+            return None
+        return {"lat": self.lat[row], "lon": self.lon[row]}
+
+    def suggest(self, prefix: str, limit: int) -> List[Suggestion]:
+        """Most populated cities whose name starts with the normalized ``prefix``."""
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._index)
+        keys = self._sorted_keys
+        rows = set()
+        start = bisect_left(keys, prefix)
+        for key in keys[start:start + MAX_PREFIX_SCAN]:
+            if not key.startswith(prefix):
+                break
+            rows.add(self._index[key])
+        ranked = sorted(rows, key=self._population.__getitem__, reverse=True)[:limit]
+        return [Suggestion(self.names[row], self.lat[row], self.lon[row]) for row in ranked]
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+
+class Geocoder:
+    """Resolves place names through the cache, the local gazetteer and ``provider``, in that order."""
+
+    def __init__(self, cache: GeocodeCache, gazetteer: Optional[Gazetteer] = None,
+                 provider: Optional["GeocodingProvider"] = None):
+        self.cache = cache
+        self.gazetteer = gazetteer
+        self.provider = provider
+
+    def geocode(self, location_name: str, remember: bool = True) -> Optional[Dict[str, float]]:
+        """Coordinates for ``location_name``, or ``None``.
+
+        Remote results are cached under ``location_name`` unless ``remember``
+        is false, as for type-ahead lookups of half-typed text.
+        """
+        query = normalize_query(location_name)
+        if not query:
+            return None
+        coords = self.cache.get(query)
+        if coords is not None:
+            METRICS.inc("geocode_cache_hits")
+            return coords
+        if self.gazetteer is not None:
+            coords = self.gazetteer.lookup(query)
+            if coords is not None:
+                METRICS.inc("gazetteer_hits")
+                return coords
+        METRICS.inc("geocode_remote_lookups")
+        with METRICS.stage("geocode_remote"):
+            coords = self._query_provider(location_name)
+        if coords is not None and remember:
+            self.cache.put(query, coords, " ".join(location_name.split()))
+        return coords
+
+    def suggest(self, text: str, limit: int = 5) -> List[Suggestion]:
+        """Local completions for ``text`` from the cache, then the gazetteer; never hits the network."""
+        prefix = normalize_query(text)
+        if not prefix:
+            return []
+        suggestions = self.cache.suggest(prefix, limit)
+        if self.gazetteer is not None and len(suggestions) < limit:
+            seen = {(round(item.lat, 2), round(item.lon, 2)) for item in suggestions}
+            for suggestion in self.gazetteer.suggest(prefix, limit):
+                if (round(suggestion.lat, 2), round(suggestion.lon, 2)) not in seen and len(suggestions) < limit:
+                    suggestions.append(suggestion)
+        return suggestions
+
+    def _query_provider(self, location_name: str) -> Optional[Dict[str, float]]:
+        if self.provider is None:
+            return None
+        try:
+            return self.provider.geocode(location_name)
+        except (OSError, ValueError, KeyError):
+            # Network and malformed-response errors mean "not found"; anything else is a bug and propagates.
+            METRICS.inc("geocode_errors")
+            return None
@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import threading
+from array import array
+from typing import List, Optional, Tuple
+
+from forecast_parser import Forecast
+
+KIND_HOURLY = 0
+KIND_DAILY = 1
+
+
+def location_key(lat: float, lon: float) -> str:
+    return f"{lat:.2f},{lon:.2f}"
+
+
+class HistoryStore:
+    """SQLite history of every fetched forecast.
+
+    ``issues`` is append-only and keeps each point of each fetch, keyed by location, series kind,
+    valid time and issue time, so forecasts can be compared with what
+    followed. ``latest`` keeps only the most recently issued value for each
+    valid time, which is the best available record of what actually
+    happened. Both are ``WITHOUT ROWID`` tables clustered on their primary
+    key, so a range query by location and time is a single index scan: a
+    year of hourly history for one site is about 8760 rows.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for table in ("issues", "latest"):
+            issued_key = ", issued_at" if table == "issues" else ""
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " location TEXT NOT NULL,"
+                " kind INTEGER NOT NULL,"
+                " dt INTEGER NOT NULL,"
+                " issued_at INTEGER NOT NULL,"
+                " temp REAL, feels_like REAL, humidity INTEGER, pressure INTEGER,"
+                " pop REAL, uvi REAL, icon TEXT,"
+                f" PRIMARY KEY (location, kind, dt{issued_key})"
+                ") WITHOUT ROWID"
+            )
+        self._conn.commit()
+
+    def record(self, key: str, issued_at: int, forecast: Forecast):
+        rows = []
+        for kind, series in ((KIND_HOURLY, forecast.hourly), (KIND_DAILY, forecast.daily)):
+            for wp in series:
+                rows.append((key, kind, wp.dt, issued_at, wp.temp, wp.feels_like, wp.humidity, wp.pressure,
+                             wp.pop, wp.uvi, wp.icon))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany(
+                "INSERT INTO latest VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (location, kind, dt) DO UPDATE SET"
+                " issued_at = excluded.issued_at, temp = excluded.temp, feels_like = excluded.feels_like,"
+                " humidity = excluded.humidity, pressure = excluded.pressure, pop = excluded.pop,"
+                " uvi = excluded.uvi, icon = excluded.icon"
+                " WHERE excluded.issued_at >= latest.issued_at",
+                rows,
+            )
+            self._conn.commit()
+
+    def temperatures(self, key: str, start: int, end: int, kind: int = KIND_HOURLY,
+                     max_points: Optional[int] = None) -> Tuple[array, array]:
+        """Return ``(dt, temp)`` columns for ``start <= dt < end``.
+
+        With ``max_points``, consecutive samples are averaged into equal-width
+        time buckets inside SQLite so long ranges stay cheap to plot.
+        """
+        if max_points and end > start:
+            bucket = max(1, -(-(end - start) // max_points))
+            query = (
+                "SELECT MIN(dt), AVG(temp) FROM latest"
+                " WHERE location = ? AND kind = ? AND dt >= ? AND dt < ?"
+                " GROUP BY (dt - ?) / ? ORDER BY 1"
+            )
+            params: tuple = (key, kind, start, end, start, bucket)
+        else:
+            query = "SELECT dt, temp FROM latest WHERE location = ? AND kind = ? AND dt >= ? AND dt < ? ORDER BY dt"
+            params = (key, kind, start, end)
+        dts, temps = array("q"), array("d")
+        with self._lock:
+            for dt, temp in self._conn.execute(query, params):
+                dts.append(dt)
+                temps.append(temp)
+        return dts, temps
+
+    def issued_forecasts(self, key: str, dt: int, kind: int = KIND_HOURLY) -> List[Tuple[int, float]]:
+        """Every ``(issued_at, temp)`` forecast made for valid time ``dt``, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT issued_at, temp FROM issues WHERE location = ? AND kind = ? AND dt = ? ORDER BY issued_at",
+                (key, kind, dt),
+            ).fetchall()
@@ -0,0 +1,141 @@
+"""Weather condition icons: bundled set, on-disk cache and an in-memory ``QPixmap`` LRU.
+
+Lookups never block on the network. A missing icon is downloaded in a worker
+and announced through ``IconStore.icon_ready``. To ship the full set with the
+app, run ``python icons.py bundle`` once; it writes every icon to
+``assets/icons/`` and later lookups are served from there.
+"""
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+from forecast_parser import WEATHER_EMOJIS
+from workers import Worker
+
+ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+ICON_CODES = tuple(WEATHER_EMOJIS)
+BUNDLED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "icons")
+DEFAULT_MAX_PIXMAPS = 64
+# Downloads run on the store's own pool so they never queue ahead of search workers.
+DOWNLOAD_THREADS = 2
+# Seconds before a failed download is attempted again.
+DEFAULT_RETRY_AFTER = 300.0
+
+
+def icon_filename(code: str) -> str:
+    return f"{code}@2x.png"
+
+
+def read_local_icon(code: str, cache_dir: str, bundled_dir: str = BUNDLED_DIR) -> Optional[bytes]:
+    """Return the PNG bytes for ``code`` from the bundled set or the disk cache."""
+    for directory in (bundled_dir, cache_dir):
+        try:
+            with open(os.path.join(directory, icon_filename(code)), "rb") as fh:
+                return fh.read()
+        except OSError:
+            continue
+    return None
+
+
+def download_icon(code: str, directory: str) -> bytes:
+    """Download ``code`` into ``directory`` and return its bytes; raises on network errors."""
+    from transport import TRANSPORT
+    resp = TRANSPORT.get(ICON_URL.format(code=code), timeout=5)
+    resp.raise_for_status()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, icon_filename(code))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(resp.content)
+    os.replace(tmp_path, path)
+    return resp.content
+
+
+class IconStore(QObject):
+    """Serves condition icons as ``QPixmap``s without touching the network on the GUI thread."""
+
+    icon_ready = pyqtSignal(str)
+
+    def __init__(self, cache_dir: str, bundled_dir: str = BUNDLED_DIR, max_pixmaps: int = DEFAULT_MAX_PIXMAPS,
+                 thread_pool: Optional[QThreadPool] = None, retry_after: float = DEFAULT_RETRY_AFTER):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.bundled_dir = bundled_dir
+        self.max_pixmaps = max_pixmaps
+        if thread_pool is None:
+            thread_pool = QThreadPool(self)
+            thread_pool.setMaxThreadCount(DOWNLOAD_THREADS)
+        self.thread_pool = thread_pool
+        self.retry_after = retry_after
+        self._pixmaps: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._in_flight: Set[str] = set()
+        # Codes whose download failed, with the time.monotonic() before which they aren't retried.
+        self._retry_at: Dict[str, float] = {}
+
+    def pixmap(self, code: str) -> Optional[QPixmap]:
+        """Return the icon for ``code``, or ``None`` and start a download if it isn't local yet."""
+        pixmap = self._pixmaps.get(code)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(code)
+            return pixmap
+        data = read_local_icon(code, self.cache_dir, self.bundled_dir)
+        if data is None:
+            self.prefetch((code,))
+            return None
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return None
+        self._pixmaps[code] = pixmap
+        while len(self._pixmaps) > self.max_pixmaps:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def prefetch(self, codes: Iterable[str]):
+        """Download, in the background, every icon in ``codes`` that isn't on disk yet.
+
+        Codes whose download failed less than ``retry_after`` seconds ago are skipped.
+        """
+        now = time.monotonic()
+        for code in set(codes):
+            if code in self._pixmaps or code in self._in_flight or self._retry_at.get(code, 0.0) > now:
+                continue
+            if os.path.exists(os.path.join(self.bundled_dir, icon_filename(code))) or \
+                    os.path.exists(os.path.join(self.cache_dir, icon_filename(code))):
+                continue
+            self._in_flight.add(code)
+            worker = Worker(download_icon, code, self.cache_dir)
+            worker.signals.result.connect(lambda _data, code=code: self._on_downloaded(code))
+            worker.signals.error.connect(lambda _message, code=code: self._on_failed(code))
+            worker.signals.finished.connect(lambda code=code: self._in_flight.discard(code))
+            self.thread_pool.start(worker)
+
+    def _on_downloaded(self, code: str):
+        self._retry_at.pop(code, None)
+        self.icon_ready.emit(code)
+
+    def _on_failed(self, code: str):
+        self._retry_at[code] = time.monotonic() + self.retry_after
+
+
+def bundle(directory: str = BUNDLED_DIR) -> int:
+    failed = 0
+    for code in ICON_CODES:
+        try:
+            download_icon(code, directory)
+        except Exception as exc:
+            failed += 1
+            print(f"{code}: {exc}", file=sys.stderr)
+    print(f"{len(ICON_CODES) - failed}/{len(ICON_CODES)} icons written to {directory}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["bundle"]:
+        print("usage: python icons.py bundle", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(bundle())
@@ -1,54 +1,75 @@
+from startup_profile import STARTUP
+
+import argparse
+import importlib
 import sys
-import io
+import json
 import os
-from dotenv import load_dotenv
+import time
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QCoreApplication, Qt, QThreadPool, QTimer, QUrl
 from PyQt5.QtWidgets import (
-    QApplication, QComboBox, QHBoxLayout, QLabel, QListWidget, QMainWindow,
-    QMessageBox, QPushButton, QTabWidget, QVBoxLayout, QWidget, QListWidgetItem, QLineEdit
+    QApplication, QComboBox, QDockWidget, QHBoxLayout, QLabel, QListView, QMainWindow, QShortcut,
+    QMessageBox, QPushButton, QTabWidget, QVBoxLayout, QWidget, QLineEdit
+)
+from PyQt5.QtGui import QIcon
+STARTUP.mark("import PyQt5")
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from autocomplete import LocationCompleter
+from dashboard import WatchlistPanel
+from details import DetailsView
+from forecast_model import ForecastItemDelegate, ForecastListModel
+from forecast_parser import Forecast, ForecastSeries, WeatherPoint, emoji_for, format_day, parse_forecast
+from history import location_key
+from icons import IconStore
+from metrics import METRICS, start_exporter
+from watchlist import Watchlist, WatchedLocation
+from weather_api import (
+    CACHE_DIR, FORECAST_CACHE, FORECAST_DAYS, FORECAST_HOURS, HISTORY, LANG, UNITS, fetch_forecast,
+    geocode_location,
 )
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtGui import QPixmap, QIcon
-
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-import requests
-import folium
-from datetime import datetime
-
-# =================== CONFIGURATION ===================
-load_dotenv()
-
-API_KEY = os.getenv("OPENWEATHER_API_KEY")
-API_URL = os.getenv("API_URL")
-EMAIL_MAP = os.getenv("EMAIL_MAP")
-
-@dataclass
-class WeatherPoint:
-    dt_txt: str
-    temp: float
-    feels_like: float
-    humidity: int
-    pressure: int
-    weather: str
-    icon: str
-    clouds: Optional[int] = None
-    dew_point: Optional[float] = None
-    uvi: Optional[float] = None
-    pop: Optional[float] = None
+from workers import Worker
+STARTUP.mark("import app modules")
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+MAP_PAGE = os.path.join(ASSETS_DIR, "map.html")
+# Chart range choices: (label, days of recorded history; 0 = current forecast).
+HISTORY_RANGES = (("Pronóstico", 0), ("Historial 7 días", 7), ("Historial 30 días", 30), ("Historial 1 año", 365))
+# Long history plots are averaged down to about this many points.
+HISTORY_MAX_POINTS = 240
 
 class WeatherWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Clima Moderno")
         self.resize(1000, 700)
-        self.setWindowIcon(QIcon("assets/weather_app_icon.ico"))
+        self.setWindowIcon(QIcon(os.path.join(ASSETS_DIR, "weather_app_icon.ico")))
 
         self._setup_ui()
-        self.hourly_data: List[WeatherPoint] = []
-        self.daily_data: List[WeatherPoint] = []
+        self._first_paint = False
+        self.profile_startup = False
+        self.startup_budget_ms: Optional[float] = None
+        self.hourly_data = ForecastSeries()
+        self.daily_data = ForecastSeries()
+        self.hourly_advice: List[Tuple[str, ...]] = []
+        self.daily_advice: List[Tuple[str, ...]] = []
         self.last_coords: Optional[Dict[str, float]] = None
+        self.thread_pool = QThreadPool.globalInstance()
+        self._active_worker: Optional[Worker] = None
+        self._search_id = 0
+        self._render_id = 0
+        # Stages of the current search, as (name, seconds), for the debug overlay.
+        self._trace: List[Tuple[str, float]] = []
+        self._search_started: Optional[float] = None
+        self.completer = LocationCompleter(self.location_input, self.thread_pool)
+        self.completer.chosen.connect(self.show_suggested_location)
+        self.icons = IconStore(os.path.join(CACHE_DIR, "icons"))
+        self.icons.icon_ready.connect(self._on_icon_ready)
+        self._wanted_icon: Optional[str] = None
+        self.last_location_name: Optional[str] = None
+        self._setup_watchlist()
 
     def _setup_ui(self):
         # Top bar
@@ -66,9 +87,26 @@ class WeatherWindow(QMainWindow):
             "QPushButton:hover { background: #A1C4FD; color: #2C3E50; }"
         )
         self.search_button.clicked.connect(self.handle_location_search)
+        self.location_input.returnPressed.connect(self.handle_location_search)
         top_bar.addWidget(location_label)
         top_bar.addWidget(self.location_input)
         top_bar.addWidget(self.search_button)
+        self.watch_button = QPushButton("Vigilar")
+        self.watch_button.setToolTip("Agregar la ubicación actual al panel de vigilancia")
+        self.watch_button.setStyleSheet(
+            "QPushButton { background: #A1C4FD; color: #2C3E50; border-radius: 8px; font-weight: bold; padding: 6px 16px; }"
+            "QPushButton:hover { background: #4A90E2; color: #F5F9FF; }"
+        )
+        self.watch_button.clicked.connect(self.watch_current_location)
+        top_bar.addWidget(self.watch_button)
+        self.chart_range = QComboBox()
+        for label, days in HISTORY_RANGES:
+            self.chart_range.addItem(label, days)
+        self.chart_range.setStyleSheet(
+            "QComboBox { background: #A1C4FD; color: #2C3E50; border-radius: 6px; padding: 4px; font-size: 14px; }"
+        )
+        self.chart_range.currentIndexChanged.connect(self.show_chart_range)
+        top_bar.addWidget(self.chart_range)
 
         self.loader_label = QLabel()
         self.loader_label.setStyleSheet("color: #4A90E2; font-size: 15px; font-weight: bold; padding-left: 10px;")
@@ -78,91 +116,102 @@ class WeatherWindow(QMainWindow):
 
         # Sidebar tabs
         self.tabs = QTabWidget()
-        self.hourly_list = QListWidget()
-        self.daily_list = QListWidget()
-        self.hourly_list.currentRowChanged.connect(self.show_hourly_details)
-        self.daily_list.currentRowChanged.connect(self.show_daily_details)
+        self.hourly_model = ForecastListModel(lambda wp: f"{wp.dt_txt} | {wp.temp:.1f}°C | {emoji_for(wp.icon)} ", self)
+        self.daily_model = ForecastListModel(lambda wp: f"{wp.dt_txt} {emoji_for(wp.icon)}  {wp.temp:.0f}°C", self)
+        self.minutely_model = ForecastListModel(lambda minute: f"{minute[0]} | {minute[1]:.2f} mm/h", self)
+        self.hourly_list = self._make_list_view(self.hourly_model)
+        self.daily_list = self._make_list_view(self.daily_model)
+        self.minutely_list = self._make_list_view(self.minutely_model)
+        self.hourly_list.selectionModel().currentRowChanged.connect(
+            lambda current, _previous: self.show_hourly_details(self.hourly_model.point_index(current.row()))
+        )
+        self.daily_list.selectionModel().currentRowChanged.connect(
+            lambda current, _previous: self.show_daily_details(self.daily_model.point_index(current.row()))
+        )
         self.tabs.addTab(self.hourly_list, "Horas")
         self.tabs.addTab(self.daily_list, "Días")
+        self.tabs.addTab(self.minutely_list, "Minutos")
         self.tabs.setMaximumWidth(220)
 
         list_style = '''
-            QListWidget {
+            QListView {
                 background: #A1C4FD;
                 color: #2C3E50;
                 border-radius: 12px;
                 font-size: 15px;
                 padding: 6px;
             }
-            QListWidget::item {
+            QListView::item {
                 border-radius: 8px;
                 padding: 8px 6px;
                 margin-bottom: 4px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background: #4A90E2;
                 color: #F5F9FF;
                 font-weight: bold;
                 border: 2px solid #D1D9E6;
             }
-            QListWidget QScrollBar:vertical {
+            QListView QScrollBar:vertical {
                 width: 10px;
                 background: transparent;
                 margin: 2px 0 2px 0;
                 border-radius: 6px;
                 opacity: 0;
             }
-            QListWidget:hover QScrollBar:vertical {
+            QListView:hover QScrollBar:vertical {
                 opacity: 1;
                 background: #EAF1FB;
             }
-            QListWidget QScrollBar::handle:vertical {
+            QListView QScrollBar::handle:vertical {
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4A90E2, stop:1 #A1C4FD);
                 min-height: 30px;
                 border-radius: 6px;
                 border: none;
             }
-            QListWidget QScrollBar::add-line:vertical,
-            QListWidget QScrollBar::sub-line:vertical {
+            QListView QScrollBar::add-line:vertical,
+            QListView QScrollBar::sub-line:vertical {
                 height: 0px;
                 background: none;
                 border: none;
             }
-            QListWidget QScrollBar::up-arrow:vertical,
-            QListWidget QScrollBar::down-arrow:vertical {
+            QListView QScrollBar::up-arrow:vertical,
+            QListView QScrollBar::down-arrow:vertical {
                 background: none;
             }
-            QListWidget QScrollBar::add-page:vertical,
-            QListWidget QScrollBar::sub-page:vertical {
+            QListView QScrollBar::add-page:vertical,
+            QListView QScrollBar::sub-page:vertical {
                 background: none;
             }
         '''
         self.hourly_list.setStyleSheet(list_style)
         self.daily_list.setStyleSheet(list_style)
-
-        # Map and details
-        self.map_view = QWebEngineView()
+        self.minutely_list.setStyleSheet(list_style)
+
+        # Map and details. The map view and the chart are created after the first
+        # paint (see _finish_startup); placeholders keep their slots in the layout.
+        self.map_view = None
+        self.map_placeholder = QWidget()
+        self._map_error: Optional[str] = None
+        self._map_ready = False
+        self._pending_location: Optional[Tuple[float, float, str]] = None
+        self._map_location: Optional[Tuple[float, float, str]] = None
         self.icon_label = QLabel()
         self.icon_label.setAlignment(Qt.AlignCenter)
-        self.details_label = QLabel("Selecciona una hora o día")
-        self.details_label.setAlignment(Qt.AlignCenter)
-        self.details_label.setWordWrap(True)
+        self.details_label = DetailsView("Selecciona una hora o día")
         self.details_label.setStyleSheet(
             "font-size: 16px; color: #2C3E50; background: #F5F9FF; border-radius: 10px; padding: 0 12px 12px 12px; text-align: center;"
         )
 
-        # Matplotlib canvas
-        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-        from matplotlib.figure import Figure
-        self.figure = Figure(figsize=(5, 3))
-        self.canvas = FigureCanvas(self.figure)
+        self.chart = None
+        self.chart_placeholder = QWidget()
 
         # Layouts
-        right_layout = QVBoxLayout()
-        right_layout.addWidget(self.map_view, stretch=3)
+        right_layout = self.right_layout = QVBoxLayout()
+        right_layout.addWidget(self.map_placeholder, stretch=3)
         right_layout.addWidget(self.icon_label, stretch=1)
         right_layout.addWidget(self.details_label, stretch=2)
-        right_layout.addWidget(self.canvas, stretch=3)
+        right_layout.addWidget(self.chart_placeholder, stretch=3)
 
         main_layout = QHBoxLayout()
         main_layout.addWidget(self.tabs)
@@ -177,6 +226,106 @@ class WeatherWindow(QMainWindow):
         container.setStyleSheet("background: #F5F9FF;")
         self.setCentralWidget(container)
 
+        self.debug_overlay = QLabel(container)
+        self.debug_overlay.setStyleSheet(
+            "background: rgba(44, 62, 80, 200); color: white; font-family: monospace; font-size: 12px;"
+            " padding: 8px; border-radius: 6px;"
+        )
+        self.debug_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.debug_overlay.hide()
+        self._metrics_were_enabled = METRICS.enabled
+        QShortcut(Qt.Key_F12, self, activated=self.toggle_debug_overlay)
+
+    def _setup_watchlist(self):
+        watchlist = Watchlist(os.path.expanduser(os.getenv("WATCHLIST_PATH", os.path.join(CACHE_DIR, "watchlist.json"))))
+        self.watchlist_panel = WatchlistPanel(watchlist, self.thread_pool)
+        self.watchlist_panel.location_activated.connect(self._show_watched_location)
+        dock = QDockWidget("Vigilancia", self)
+        dock.setWidget(self.watchlist_panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, dock)
+
+    def watch_current_location(self):
+        if self.last_coords is None or not self.last_location_name:
+            QMessageBox.information(self, "Sin ubicación", "Busca una ubicación antes de agregarla al panel.")
+            return
+        self.watchlist_panel.add_location(
+            WatchedLocation(self.last_location_name, self.last_coords["lat"], self.last_coords["lon"])
+        )
+
+    def _show_watched_location(self, location: WatchedLocation, forecast: Forecast):
+        # Supersede any search in flight so its result doesn't overwrite this view.
+        self._search_id += 1
+        self._trace = []
+        self._search_started = None
+        coords = {"lat": location.lat, "lon": location.lon}
+        self.last_coords = coords
+        self.last_location_name = location.name
+        self.render_weather(forecast, coords, location.name)
+
+    def _make_list_view(self, model: ForecastListModel) -> QListView:
+        view = QListView()
+        view.setModel(model)
+        view.setItemDelegate(ForecastItemDelegate(view))
+        view.setUniformItemSizes(True)
+        return view
+
+    # -------------------------------------------------
+    # Deferred initialization
+    # -------------------------------------------------
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_debug_overlay()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint:
+            self._first_paint = True
+            STARTUP.mark("first paint")
+            QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        self._init_chart()
+        self._init_map()
+        self._init_http()
+        if self.profile_startup:
+            self._report_startup()
+
+    def _init_chart(self):
+        if self.chart is not None:
+            return
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        from chart import TemperatureChart
+        self.figure = Figure(figsize=(5, 3))
+        self.canvas = FigureCanvas(self.figure)
+        self.chart = TemperatureChart(self.figure, self.canvas)
+        self.right_layout.replaceWidget(self.chart_placeholder, self.canvas)
+        self.chart_placeholder.deleteLater()
+        STARTUP.mark("chart ready")
+
+    def _init_map(self):
+        if self.map_view is not None or self._map_error is not None:
+            return
+        try:
+            from PyQt5.QtWebEngineWidgets import QWebEngineSettings, QWebEngineView
+        except ImportError as exc:
+            # QtWebEngine needs system libraries headless machines often lack; the rest works without the map.
+            self._map_error = str(exc)
+            print(f"Mapa no disponible: {exc}", file=sys.stderr)
+            return
+        # The Leaflet page (bundled in assets/) is loaded once; locations are pushed to it via JavaScript.
+        self.map_view = QWebEngineView()
+        self.map_view.settings().setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
+        self.map_view.loadFinished.connect(self._on_map_loaded)
+        self.map_view.load(QUrl.fromLocalFile(MAP_PAGE))
+        self.right_layout.replaceWidget(self.map_placeholder, self.map_view)
+        self.map_placeholder.deleteLater()
+        STARTUP.mark("map view created")
+
+    def _init_http(self):
+        # Warm the HTTP stack off the GUI thread so the first search doesn't pay for it.
+        self.thread_pool.start(Worker(importlib.import_module, "transport"))
+
     # -------------------------------------------------
     # Networking and Geocoding
     # -------------------------------------------------
@@ -185,65 +334,169 @@ class WeatherWindow(QMainWindow):
         if not location_name:
             QMessageBox.warning(self, "Campo vacío", "Por favor, ingresa una ubicación.")
             return
+        coords = self.completer.coords_for(location_name)
+        if coords is not None:
+            self.show_suggested_location(location_name, coords)
+            return
+        # A newer search replaces whatever is still in flight.
+        self._search_id += 1
+        search_id = self._search_id
+        self._trace = []
+        self._search_started = time.perf_counter()
         self.show_loader(True, "Buscando ubicación...")
-        QApplication.processEvents()
-        coords = self.geocode_location(location_name)
+        self._start_worker(
+            geocode_location, location_name,
+            on_result=lambda coords: self._on_geocoded(search_id, location_name, coords),
+            on_error=lambda message: self._on_geocode_error(search_id, message),
+        )
+
+    def show_suggested_location(self, label: str, coords: Dict[str, float]):
+        # Coordinates are already known and the forecast was likely prefetched: skip geocoding.
+        self._search_id += 1
+        self._trace = []
+        self._search_started = time.perf_counter()
+        if self._active_worker is not None:
+            self._active_worker.cancel()
+            self._active_worker = None
+        self._on_geocoded(self._search_id, label, coords)
+
+    def _start_worker(self, fn: Callable, *args, on_result: Callable, on_error: Optional[Callable] = None):
+        if self._active_worker is not None:
+            self._active_worker.cancel()
+        if METRICS.enabled:
+            fn = self._traced(fn, self._trace)
+        worker = Worker(fn, *args)
+        worker.signals.result.connect(on_result)
+        if on_error is not None:
+            worker.signals.error.connect(on_error)
+        self._active_worker = worker
+        self.thread_pool.start(worker)
+
+    @staticmethod
+    def _traced(fn: Callable, trace: List[Tuple[str, float]]) -> Callable:
+        def run(*args):
+            with METRICS.tracing(trace):
+                return fn(*args)
+        return run
+
+    def _on_geocoded(self, search_id: int, location_name: str, coords: Optional[Dict[str, float]]):
+        if search_id != self._search_id:
+            return
         if coords is None:
             self.show_loader(False)
             QMessageBox.critical(self, "Ubicación no encontrada", f"No se pudo encontrar la ubicación: {location_name}")
             return
         self.last_coords = coords
-        self.fetch_weather(coords, location_name)
-        self.show_loader(False)
+        self.last_location_name = location_name
+        # The map page loads its tiles while the forecast is fetched.
+        self.update_map(coords["lat"], coords["lon"], location_name)
+        cached = FORECAST_CACHE.get(coords["lat"], coords["lon"], UNITS, LANG)
+        if cached is not None:
+            self.render_weather(parse_forecast(cached.data, FORECAST_HOURS, FORECAST_DAYS), coords, location_name)
+            if cached.fresh:
+                return
+            # Stale-while-revalidate: keep the cached forecast on screen and refresh it.
+            self.show_loader(True, "Actualizando clima...")
+        else:
+            self.show_loader(True, "Cargando clima...")
+        self._start_worker(
+            fetch_forecast, coords,
+            on_result=lambda forecast: self._on_weather_loaded(search_id, coords, location_name, forecast),
+            on_error=lambda message: self._on_weather_error(search_id, message, showing_cached=cached is not None),
+        )
 
-    def geocode_location(self, location_name: str) -> Optional[Dict[str, float]]:
-        try:
-            url = "https://nominatim.openstreetmap.org/search"
-            params = {"q": location_name, "format": "json", "limit": 1}
-            headers = {"User-Agent": f"WeatherApp/1.0 {EMAIL_MAP}"}
-            resp = requests.get(url, params=params, headers=headers, timeout=8)
-            resp.raise_for_status()
-            results = resp.json()
-            if not results:
-                return None
-            lat = float(results[0]["lat"])
-            lon = float(results[0]["lon"])
-            return {"lat": lat, "lon": lon}
-        except Exception:
-            return None
-
-    def fetch_weather(self, coords: Dict[str, float], location_name: str):
-        self.show_loader(True, "Cargando clima...")
-        QApplication.processEvents()
-        params = {
-            "lat": coords["lat"],
-            "lon": coords["lon"],
-            "appid": API_KEY,
-            "units": "metric",
-            "exclude": "minutely",
-            "lang": "es",
-        }
-        try:
-            response = requests.get(API_URL, params=params, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as exc:
-            self.show_loader(False)
-            QMessageBox.critical(self, "Error de red", str(exc))
+    def _on_geocode_error(self, search_id: int, message: str):
+        if search_id != self._search_id:
             return
+        self.show_loader(False)
+        QMessageBox.critical(self, "Error de búsqueda", f"No se pudo buscar la ubicación: {message}")
 
-        data = response.json()
-        self.hourly_data.clear()
-        self.daily_data.clear()
-        self.hourly_list.clear()
-        self.daily_list.clear()
+    def _on_weather_error(self, search_id: int, message: str, showing_cached: bool = False):
+        if search_id != self._search_id:
+            return
+        self.show_loader(False)
+        # A failed revalidation leaves the stale but still usable forecast on screen.
+        if not showing_cached:
+            QMessageBox.critical(self, "Error de red", message)
 
-        self._populate_hourly_list(data)
-        self._populate_daily_list(data)
+    def _on_weather_loaded(self, search_id: int, coords: Dict[str, float], location_name: str, forecast: Forecast):
+        if search_id != self._search_id:
+            return
+        self._active_worker = None
+        self.render_weather(forecast, coords, location_name)
+
+    def render_weather(self, forecast: Forecast, coords: Dict[str, float], location_name: str):
+        """Show ``forecast`` in stages, most useful first.
+
+        The hourly list (and the map, if it isn't already there) is filled
+        right away. The daily and minutely lists, then the chart, follow on
+        later event-loop turns, so the hourly list is painted before the
+        slower stages run. A newer render cancels the pending stages of an
+        older one.
+        """
+        from rules import assess
+        self._render_id += 1
+        render_id = self._render_id
+        with METRICS.tracing(self._trace):
+            with METRICS.stage("update_map"):
+                self.update_map(coords["lat"], coords["lon"], location_name)
+            with METRICS.stage("assess"):
+                # Recommendations for every entry are computed once here; selection only looks them up.
+                hourly_advice = assess(forecast.hourly.points).recommendations
+            self.hourly_data = forecast.hourly
+            self.hourly_advice = hourly_advice
+            self.icons.prefetch(wp.icon for series in (forecast.hourly, forecast.daily) for wp in series)
+            with METRICS.stage("populate_hourly"):
+                self.hourly_model.set_series(forecast.hourly, forecast.hourly.day_headers)
+            self.details_label.show_message("Selecciona una hora o día para ver los detalles")
+            self.show_loader(False)
+            if self._search_started is not None:
+                METRICS.observe("search_to_hourly", time.perf_counter() - self._search_started)
+        self._update_debug_overlay()
+        QTimer.singleShot(0, lambda: self._render_rest(render_id, forecast))
 
-        self.update_map(coords["lat"], coords["lon"], location_name)
-        self.plot_temperatures([h.temp for h in self.hourly_data], "Próximas horas")
-        self.details_label.setText("Selecciona una hora o día para ver los detalles")
-        self.show_loader(False)
+    def _render_rest(self, render_id: int, forecast: Forecast):
+        if render_id != self._render_id:
+            return
+        from rules import assess
+        with METRICS.tracing(self._trace):
+            with METRICS.stage("populate_daily"):
+                self.daily_advice = assess(forecast.daily.points).recommendations
+                self.daily_data = forecast.daily
+                self.daily_model.set_series(forecast.daily)
+                self.minutely_model.set_series(forecast.minutely)
+        QTimer.singleShot(0, lambda: self._render_chart(render_id))
+
+    def _render_chart(self, render_id: int):
+        if render_id != self._render_id:
+            return
+        with METRICS.tracing(self._trace):
+            with METRICS.stage("plot_temperatures"):
+                self.show_chart_range()
+            if self._search_started is not None:
+                METRICS.observe("search_to_render", time.perf_counter() - self._search_started)
+                self._search_started = None
+        self._update_debug_overlay()
+
+    def toggle_debug_overlay(self):
+        if self.debug_overlay.isVisible():
+            self.debug_overlay.hide()
+            METRICS.enabled = self._metrics_were_enabled
+            return
+        # Stages are only timed while metrics are on; the next search fills the overlay.
+        self._metrics_were_enabled = METRICS.enabled
+        METRICS.enabled = True
+        self.debug_overlay.show()
+        self._update_debug_overlay()
+
+    def _update_debug_overlay(self):
+        if not self.debug_overlay.isVisible():
+            return
+        lines = [f"{name:<18}{seconds * 1000:>9.1f} ms" for name, seconds in self._trace]
+        self.debug_overlay.setText("\n".join(lines) or "Sin datos: realiza una búsqueda")
+        self.debug_overlay.adjustSize()
+        self.debug_overlay.move(self.centralWidget().width() - self.debug_overlay.width() - 12, 12)
+        self.debug_overlay.raise_()
 
     def show_loader(self, show: bool, text: str = ""):
         self.loader_label.setText(text if show else "")
@@ -252,242 +505,133 @@ class WeatherWindow(QMainWindow):
     # -------------------------------------------------
     # Utility methods
     # -------------------------------------------------
-    @staticmethod
-    def unix_to_hour(ts: int) -> str:
-        dt = datetime.fromtimestamp(ts)
-        hour_12 = dt.strftime("%I:%M %p").lstrip("0")
-        return hour_12
-
     def update_map(self, lat: float, lon: float, location: str):
-        fmap = folium.Map(location=[lat, lon], zoom_start=10)
-        folium.Marker([lat, lon], tooltip=location).add_to(fmap)
-        data = io.BytesIO()
-        fmap.save(data, close_file=False)
-        html = data.getvalue().decode()
-        self.map_view.setHtml(html)
+        if (lat, lon, location) == self._map_location:
+            return
+        if self.map_view is None:
+            self._init_map()
+        if not self._map_ready:
+            self._pending_location = (lat, lon, location)
+            return
+        self._map_location = (lat, lon, location)
+        self.map_view.page().runJavaScript(f"showLocation({lat}, {lon}, {json.dumps(location)});")
+
+    def _on_map_loaded(self, ok: bool):
+        self._map_ready = ok
+        if ok and self._pending_location is not None:
+            self.update_map(*self._pending_location)
+            self._pending_location = None
+
+    def _report_startup(self):
+        # Let the HTTP warm-up finish so the exit doesn't race it.
+        self.thread_pool.waitForDone()
+        STARTUP.mark("http ready")
+        print(STARTUP.report(), file=sys.stderr)
+        first_paint_ms = STARTUP.elapsed_ms("first paint")
+        if self.startup_budget_ms is not None and first_paint_ms > self.startup_budget_ms:
+            print(f"time to first window {first_paint_ms:.1f} ms exceeds budget of {self.startup_budget_ms:.1f} ms",
+                  file=sys.stderr)
+            QApplication.exit(1)
+        else:
+            QApplication.exit(0)
 
     def show_hourly_details(self, index: int):
         if 0 <= index < len(self.hourly_data):
             wp = self.hourly_data[index]
-            self.update_details(wp)
-            self.plot_temperatures([h.temp for h in self.hourly_data], "Próximas horas")
+            self.update_details(wp, self.hourly_advice[index])
+            self._reset_chart_range()
+            self.plot_temperatures(self.hourly_data.temp, "Próximas horas")
+            self.chart.highlight(index)
 
     def show_daily_details(self, index: int):
         if 0 <= index < len(self.daily_data):
             wp = self.daily_data[index]
-            self.update_details(wp)
-            self.plot_temperatures([d.temp for d in self.daily_data], "Próximos días")
-
-    def update_details(self, wp: WeatherPoint):
-        weather_emojis = {
-            "01d": "☀️", "01n": "🌙",
-            "02d": "🌤️", "02n": "🌤️",
-            "03d": "☁️", "03n": "☁️",
-            "04d": "☁️", "04n": "☁️",
-            "09d": "🌧️", "09n": "🌧️",
-            "10d": "🌦️", "10n": "🌦️",
-            "11d": "⛈️", "11n": "⛈️",
-            "13d": "❄️", "13n": "❄️",
-            "50d": "🌫️", "50n": "🌫️",
-        }
-        emoji = weather_emojis.get(wp.icon, "❓")
-
-        pop = wp.pop
-        uvi = wp.uvi
-        dew_point = wp.dew_point
-        clouds = wp.clouds
-
-        recommendations = []
-        if pop is not None:
-            if pop >= 0.8:
-                recommendations.append("☔ Muy alta probabilidad de lluvia. Lleva paraguas y ropa impermeable.")
-            elif pop >= 0.5:
-                recommendations.append("🌦️ Probabilidad media de lluvia. Considera llevar paraguas.")
-            elif pop >= 0.2:
-                recommendations.append("🌦️ Baja probabilidad de lluvia. Probablemente no necesites paraguas.")
-            else:
-                recommendations.append("🌤️ Muy baja probabilidad de lluvia. Disfruta tu día.")
-        else:
-            recommendations.append("🌤️ No se espera lluvia. Disfruta tu día.")
-        if uvi is not None and uvi >= 6:
-            recommendations.append("🧴 Usa protector solar, el índice UV es alto.")
-        if wp.temp >= 30:
-            recommendations.append("🥵 Hace calor, mantente hidratado.")
-        if wp.temp <= 5:
-            recommendations.append("🧥 Hace frío, abrígate bien.")
-        if wp.humidity >= 80:
-            recommendations.append("💧 Humedad alta, puede sentirse bochornoso.")
-        if len(recommendations) == 1:
-            recommendations.append("✅ El clima es agradable, ¡disfruta tu día!")
-
-        details_html = f'''
-        <div style="display: flex; align-items: center; gap: 18px;">
-            <span style="font-size: 4.5em; width:90px; height:90px; display: flex; align-items: center; justify-content: center; background: #EAF1FB; border-radius: 18px; box-shadow: 0 2px 8px #A1C4FD55;">{emoji}</span>
-            <div style="flex:1;">
-                <div style="font-size: 1.5em; font-weight: bold; color: #2C3E50; margin-bottom: 2px;">{wp.dt_txt}</div>
-                <div style="font-size: 1.2em; color: #4A90E2; font-weight: bold;">{wp.weather.capitalize()}</div>
-                <div style="margin-top: 8px;">
-                    <span style="font-size: 1.1em; color: #2C3E50;">🌡️ {wp.temp} °C</span> &nbsp; 
-                    <span style="color: #7B8FA1;">Sensación: {wp.feels_like} °C</span>
-                </div>
-                <div style="margin-top: 4px; color: #2C3E50;">
-                    💧 {wp.humidity}% &nbsp; | &nbsp; ⬇️ {wp.pressure} hPa
-                </div>
-                <div style="margin-top: 4px; color: #2C3E50;">
-                    ☁️ Nubes: {clouds if clouds is not None else '-'}% &nbsp; | &nbsp; 🧊 Punto de rocío: {dew_point if dew_point is not None else '-'}°C &nbsp; | &nbsp; ☀️ UV: {uvi if uvi is not None else '-'}
-                </div>
-                <div style="margin-top: 10px; font-size: 1.1em; color: #4A90E2; font-weight: bold;">
-                    {'<br>'.join(recommendations)}
-                </div>
-            </div>
-        </div>
-        '''
-        self.details_label.setText(details_html)
-        self.icon_label.clear()
+            self.update_details(wp, self.daily_advice[index])
+            self._reset_chart_range()
+            self.plot_temperatures(self.daily_data.temp, "Próximos días")
+            self.chart.highlight(index)
+
+    def update_details(self, wp: WeatherPoint, recommendations: Sequence[str]):
+        self.details_label.show_point(wp, recommendations)
+        self.load_icon(wp.icon)
 
     def load_icon(self, code: str):
-        try:
-            url = f"https://openweathermap.org/img/wn/{code}@2x.png"
-            resp = requests.get(url, timeout=5)
-            pixmap = QPixmap()
-            pixmap.loadFromData(resp.content)
-            self.icon_label.setPixmap(pixmap)
-        except Exception:
+        self._wanted_icon = code
+        pixmap = self.icons.pixmap(code)
+        if pixmap is None:
+            # Shown by _on_icon_ready once the background download lands.
             self.icon_label.clear()
+        else:
+            self.icon_label.setPixmap(pixmap)
 
-    def plot_temperatures(self, temps: List[float], title: str):
-        import numpy as np
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.set_facecolor("#F5F9FF")
-        self.figure.set_facecolor("#F5F9FF")
+    def _on_icon_ready(self, code: str):
+        if code == self._wanted_icon:
+            self.load_icon(code)
 
-        if title.startswith("Próximas horas") and hasattr(self, "hourly_data") and len(self.hourly_data) == len(temps):
+    def plot_temperatures(self, temps: Sequence[float], title: str):
+        if title.startswith("Próximas horas") and len(self.hourly_data) == len(temps):
             xlabels = [h.dt_txt for h in self.hourly_data]
-        elif title.startswith("Próximos días") and hasattr(self, "daily_data") and len(self.daily_data) == len(temps):
+            xlabel = "Hora"
+        elif title.startswith("Próximos días") and len(self.daily_data) == len(temps):
             xlabels = [d.dt_txt for d in self.daily_data]
+            xlabel = "Día"
         else:
             xlabels = [str(i+1) for i in range(len(temps))]
-
-        x = np.arange(len(temps))
-        ax.plot(x, temps, color="#4A90E2", marker="o", markerfacecolor="#A1C4FD", markeredgecolor="#2C3E50", linewidth=2, zorder=3)
-        ax.fill_between(x, temps, min(temps)-2, color="#A1C4FD", alpha=0.25, zorder=2)
-        if len(temps) <= 12:
-            for i, temp in enumerate(temps):
-                ax.text(i, temp+0.5, f"{temp:.1f}°", ha="center", va="bottom", fontsize=10, color="#2C3E50", fontweight="bold", zorder=4)
-
-        max_labels = 10 if len(temps) > 10 else len(temps)
-        step = max(1, len(temps) // max_labels)
-        shown_labels = [label if (i % step == 0 or i == len(temps)-1) else "" for i, label in enumerate(xlabels)]
-        ax.set_xticks(x)
-        ax.set_xticklabels(shown_labels, rotation=35, ha="right", fontsize=9)
-
-        ax.set_title(title, color="#2C3E50", fontsize=15, fontweight="bold", pad=15)
-        ax.set_ylabel("Temperatura (°C)", color="#2C3E50", fontsize=12)
-        ax.set_xlabel("Hora" if title.startswith("Próximas horas") else ("Día" if title.startswith("Próximos días") else "Tiempo"), color="#2C3E50", fontsize=12)
-        ax.tick_params(axis='x', colors="#2C3E50", labelsize=10)
-        ax.tick_params(axis='y', colors="#2C3E50", labelsize=10)
-        ax.grid(True, alpha=0.25, color="#B0C4DE", linestyle='--', zorder=1)
-        for spine in ax.spines.values():
-            spine.set_color("#B0C4DE")
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        self.figure.tight_layout(pad=2.0)
-        self.canvas.draw()
-
-    def _populate_hourly_list(self, data: dict):
-        last_day = None
-        weather_emojis = {
-            "01d": "☀️", "01n": "🌙",
-            "02d": "🌤️", "02n": "🌤️",
-            "03d": "☁️", "03n": "☁️",
-            "04d": "☁️", "04n": "☁️",
-            "09d": "🌧️", "09n": "🌧️",
-            "10d": "🌦️", "10n": "🌦️",
-            "11d": "⛈️", "11n": "⛈️",
-            "13d": "❄️", "13n": "❄️",
-            "50d": "🌫️", "50n": "🌫️",
-        }
-        days = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
-        meses = ["ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic"]
-        for hour in data.get("hourly", [])[:24]:
-            dt_obj = datetime.fromtimestamp(hour.get("dt"))
-            dt_txt = self.unix_to_hour(hour.get("dt"))
-            icon = hour.get("weather", [{}])[0].get("icon", "01d")
-            emoji = weather_emojis.get(icon, "❓")
-            wp = WeatherPoint(
-                dt_txt,
-                hour.get("temp", 0.0),
-                hour.get("feels_like", 0.0),
-                hour.get("humidity", 0),
-                hour.get("pressure", 0),
-                hour.get("weather", [{}])[0].get("description", ""),
-                icon,
-                hour.get("clouds"),
-                hour.get("dew_point"),
-                hour.get("uvi"),
-                hour.get("pop"),
-            )
-            if last_day != dt_obj.date():
-                weekday = days[dt_obj.weekday()]
-                day = dt_obj.day
-                month = meses[dt_obj.month - 1]
-                day_str = f"{weekday.capitalize()}, {day:02d} {month}"
-                day_item = QListWidgetItem(day_str)
-                day_item.setFlags(day_item.flags() & ~Qt.ItemIsSelectable & ~Qt.ItemIsEnabled)
-                day_item.setTextAlignment(Qt.AlignCenter)
-                day_item.setBackground(Qt.transparent)
-                day_item.setForeground(Qt.darkBlue)
-                day_item.setFont(self.font())
-                self.hourly_list.addItem(day_item)
-                last_day = dt_obj.date()
-            self.hourly_data.append(wp)
-            item_text = f"{dt_txt} | {wp.temp:.1f}°C | {emoji} "
-            self.hourly_list.addItem(item_text)
-
-    def _populate_daily_list(self, data: dict):
-        weather_emojis = {
-            "01d": "☀️", "01n": "🌙",
-            "02d": "🌤️", "02n": "🌤️",
-            "03d": "☁️", "03n": "☁️",
-            "04d": "☁️", "04n": "☁️",
-            "09d": "🌧️", "09n": "🌧️",
-            "10d": "🌦️", "10n": "🌦️",
-            "11d": "⛈️", "11n": "⛈️",
-            "13d": "❄️", "13n": "❄️",
-            "50d": "🌫️", "50n": "🌫️",
-        }
-        days_shorts = ["lun", "mar", "mié", "jue", "vie", "sáb", "dom"]
-        meses = ["ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic"]
-        for day in data.get("daily", [])[:7]:
-            dt_obj = datetime.fromtimestamp(day.get("dt"))
-            weekday = days_shorts[dt_obj.weekday()]
-            day_num = dt_obj.day
-            month = meses[dt_obj.month - 1]
-            dt_txt = f"{weekday.capitalize()}, {day_num:02d} {month}"
-            icon = day.get("weather", [{}])[0].get("icon", "01d")
-            emoji = weather_emojis.get(icon, "❓")
-            temp = day.get("temp", {}).get("day", 0.0)
-            wp = WeatherPoint(
-                dt_txt,
-                temp,
-                day.get("feels_like", {}).get("day", 0.0),
-                day.get("humidity", 0),
-                day.get("pressure", 0),
-                day.get("weather", [{}])[0].get("description", ""),
-                icon,
-                day.get("clouds"),
-                day.get("dew_point"),
-                day.get("uvi"),
-                day.get("pop"),
-            )
-            self.daily_data.append(wp)
-            item_text = f"{dt_txt} {emoji}  {temp:.0f}°C"
-            self.daily_list.addItem(item_text)
+            xlabel = "Tiempo"
+        self._init_chart()
+        self.chart.set_data(temps, xlabels, title, xlabel)
+
+    def _reset_chart_range(self):
+        # Selecting a forecast entry switches the chart back to the forecast.
+        if self.chart_range.currentIndex() != 0:
+            self.chart_range.blockSignals(True)
+            self.chart_range.setCurrentIndex(0)
+            self.chart_range.blockSignals(False)
+
+    def show_chart_range(self, index: Optional[int] = None):
+        days = self.chart_range.currentData()
+        if not days:
+            self.plot_temperatures(self.hourly_data.temp, "Próximas horas")
+            return
+        if self.last_coords is None:
+            return
+        end = int(time.time())
+        dts, temps = HISTORY.temperatures(
+            location_key(self.last_coords["lat"], self.last_coords["lon"]),
+            end - days * 86400, end, max_points=HISTORY_MAX_POINTS,
+        )
+        if not temps:
+            self._reset_chart_range()
+            self.plot_temperatures(self.hourly_data.temp, "Próximas horas")
+            if index is not None:
+                QMessageBox.information(self, "Sin historial", "Aún no hay datos guardados para esta ubicación.")
+            return
+        self._init_chart()
+        self.chart.set_data(temps, [format_day(dt, short=True) for dt in dts], f"Historial ({days} días)", "Fecha")
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Clima Moderno")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import/phase timing breakdown once the window is up, then exit")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help="with --profile-startup, exit with status 1 if the first paint takes longer than MS")
+    parser.add_argument("--debug-overlay", action="store_true",
+                        help="time each search stage and show the breakdown over the window (toggle with F12)")
+    args, qt_args = parser.parse_known_args()
+
+    # Lets QtWebEngine be imported after the QApplication exists (see _init_map).
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv[:1] + qt_args)
+    STARTUP.mark("QApplication created")
     win = WeatherWindow()
+    win.profile_startup = args.profile_startup
+    win.startup_budget_ms = args.startup_budget
+    STARTUP.mark("window constructed")
+    if args.debug_overlay:
+        win.toggle_debug_overlay()
+    exporter = start_exporter()
+    if exporter is not None:
+        app.aboutToQuit.connect(exporter.stop)
     win.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,217 @@
+"""Per-stage latency histograms and counters for the search → render pipeline.
+
+Disabled by default: ``METRICS.stage()`` then returns a shared no-op context
+and ``inc``/``observe`` return immediately, so instrumented code pays one
+attribute check. When enabled, each stage's duration lands in a fixed-bucket
+histogram, and also in the trace of the thread's current operation, if
+``tracing`` set one. The window uses that trace for its debug overlay.
+
+``MetricsExporter`` periodically writes everything as Prometheus text or
+JSONL to a file, or POSTs it to an HTTP endpoint.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds, as in Prometheus' default buckets.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_EXPORT_INTERVAL = 15.0
+PREFIX = "weather"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        # Callables returning extra counters (e.g. cache statistics) read at export time.
+        self.collectors: List[Callable[[], Dict[str, float]]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stage(self, name: str):
+        return _Stage(self, name) if self.enabled else _NO_STAGE
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.append((name, seconds))
+
+    def inc(self, name: str, amount: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def tracing(self, trace: Optional[List[Tuple[str, float]]]) -> Iterator[None]:
+        """Also append stages observed on this thread to ``trace`` while the block runs."""
+        previous = getattr(self._local, "trace", None)
+        self._local.trace = trace
+        try:
+            yield
+        finally:
+            self._local.trace = previous
+
+    def snapshot(self) -> Tuple[Dict[str, Tuple[List[int], float, int]], Dict[str, float]]:
+        with self._lock:
+            histograms = {name: (h.cumulative(), h.sum, h.count) for name, h in self.histograms.items()}
+            counters = dict(self.counters)
+        for collector in self.collectors:
+            counters.update(collector())
+        return histograms, counters
+
+    def prometheus(self) -> str:
+        histograms, counters = self.snapshot()
+        lines = [f"# TYPE {PREFIX}_stage_seconds histogram"]
+        for name, (cumulative, total, count) in sorted(histograms.items()):
+            for bound, value in zip(BUCKETS + (float("inf"),), cumulative):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="{le}"}} {value}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {total}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {count}')
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    def jsonl(self) -> str:
+        histograms, counters = self.snapshot()
+        record = {
+            "ts": time.time(),
+            "stages": {name: {"buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], cumulative)),
+                              "sum": total, "count": count}
+                       for name, (cumulative, total, count) in histograms.items()},
+            "counters": counters,
+        }
+        return json.dumps(record) + "\n"
+
+
+class MetricsExporter:
+    """Writes ``metrics`` every ``interval`` seconds from a daemon thread, and once more on ``stop``.
+
+    ``target`` is a file path or an ``http(s)://`` URL. Prometheus files are
+    replaced atomically, in the format the node_exporter textfile collector
+    reads; JSONL files get one line per export.
+    """
+
+    def __init__(self, metrics: Metrics, target: str, fmt: Optional[str] = None,
+                 interval: float = DEFAULT_EXPORT_INTERVAL):
+        self.metrics = metrics
+        self.target = target
+        self.format = fmt or ("jsonl" if target.endswith(".jsonl") else "prometheus")
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsExporter":
+        self._thread = threading.Thread(target=self._run, name="metrics-export", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.export()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def export(self):
+        body = self.metrics.jsonl() if self.format == "jsonl" else self.metrics.prometheus()
+        try:
+            if self.target.startswith(("http://", "https://")):
+                # Imported here: urllib.request is slow to import and most setups export to a file.
+                import urllib.request
+                content_type = "application/x-ndjson" if self.format == "jsonl" else "text/plain; version=0.0.4"
+                request = urllib.request.Request(self.target, body.encode(), {"Content-Type": content_type})
+                urllib.request.urlopen(request, timeout=5).close()
+            elif self.format == "jsonl":
+                with open(self.target, "a", encoding="utf-8") as fh:
+                    fh.write(body)
+            else:
+                tmp_path = f"{self.target}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    fh.write(body)
+                os.replace(tmp_path, self.target)
+        except OSError:
+            pass
+
+
+METRICS_EXPORT = os.getenv("METRICS_EXPORT")
+METRICS = Metrics(enabled=bool(METRICS_EXPORT) or os.getenv("WEATHER_METRICS") == "1")
+
+
+def start_exporter() -> Optional[MetricsExporter]:
+    """Start the exporter configured by ``METRICS_EXPORT``/``METRICS_FORMAT``/``METRICS_INTERVAL``, if any."""
+    if not METRICS_EXPORT:
+        return None
+    return MetricsExporter(
+        METRICS,
+        os.path.expanduser(METRICS_EXPORT),
+        os.getenv("METRICS_FORMAT"),
+        float(os.getenv("METRICS_INTERVAL", str(DEFAULT_EXPORT_INTERVAL))),
+    ).start()
@@ -0,0 +1,166 @@
+"""Deterministic local stand-in for the One Call and Nominatim APIs.
+
+    python mock_server.py --port 8765 --latency 0.05 --jitter 0.02 --error-rate 0.01
+
+``/onecall`` and ``/search`` answer like the real services. The data depends
+only on the request coordinates or query, and injected latency and errors come
+from a generator seeded with ``seed``. A given sequence of requests therefore
+produces the same results every run, and throughput or tail-latency tests
+need neither network access nor API quota.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+HOUR = 3600
+DAY = 24 * HOUR
+CONDITIONS = (
+    ("01d", "cielo claro"), ("02d", "algo de nubes"), ("03d", "nubes dispersas"), ("04d", "nubes"),
+    ("09d", "lluvia ligera"), ("10d", "lluvia moderada"), ("11d", "tormenta"), ("13d", "nieve"),
+    ("50d", "niebla"),
+)
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32(repr(parts).encode())
+
+
+def mock_forecast(lat: float, lon: float, now: Optional[int] = None) -> dict:
+    """One Call shaped forecast that depends only on ``lat``, ``lon`` and the current hour."""
+    start = (int(time.time()) if now is None else now) // HOUR * HOUR
+    rng = random.Random(_seed(round(lat, 2), round(lon, 2), start))
+    base = 25 - abs(lat) * 0.4
+
+    def point(ts: int, temp: float) -> dict:
+        icon, description = rng.choice(CONDITIONS)
+        humidity = rng.randint(30, 95)
+        return {
+            "dt": ts, "temp": round(temp, 2), "feels_like": round(temp - rng.random() * 2, 2),
+            "humidity": humidity, "pressure": rng.randint(995, 1030), "clouds": rng.randint(0, 100),
+            "dew_point": round(temp - (100 - humidity) / 5, 2), "uvi": round(rng.random() * 10, 2),
+            "pop": round(rng.random(), 2), "wind_speed": round(rng.random() * 12, 2),
+            "weather": [{"description": description, "icon": icon}],
+        }
+
+    hourly = [point(start + i * HOUR, base + 6 * math.sin((i + start // HOUR) * math.pi / 12)) for i in range(48)]
+    daily = []
+    for i in range(8):
+        entry = point(start + i * DAY, base + rng.uniform(-4, 4))
+        entry["temp"] = {"day": entry["temp"]}
+        entry["feels_like"] = {"day": entry["feels_like"]}
+        daily.append(entry)
+    minutely = [{"dt": start + i * 60, "precipitation": round(max(0.0, rng.gauss(0, 0.5)), 2)} for i in range(61)]
+    return {"lat": lat, "lon": lon, "timezone_offset": 0, "hourly": hourly, "daily": daily, "minutely": minutely}
+
+
+def mock_geocode(query: str) -> list:
+    """Nominatim shaped result with coordinates derived from ``query``; empty for blank queries."""
+    if not query.strip():
+        return []
+    rng = random.Random(_seed(query.strip().casefold()))
+    return [{"lat": f"{rng.uniform(-60, 70):.6f}", "lon": f"{rng.uniform(-180, 180):.6f}", "display_name": query}]
+
+
+class MockWeatherServer:
+    """Threaded HTTP server with injectable latency (``latency`` ± ``jitter`` seconds) and error rate."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.requests = 0
+        self.errors = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._rng_lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+        return delay, failed
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                delay, failed = server._draw()
+                if delay:
+                    time.sleep(delay)
+                if failed:
+                    self.send_error(503, "injected error")
+                    return
+                try:
+                    if url.path == "/onecall":
+                        body = mock_forecast(float(query["lat"]), float(query["lon"]))
+                    elif url.path == "/search":
+                        body = mock_geocode(query.get("q", ""))
+                    else:
+                        self.send_error(404)
+                        return
+                except (KeyError, ValueError):
+                    self.send_error(400)
+                    return
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MockWeatherServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-weather", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve deterministic fake forecasts and geocoding results.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random ± seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server = MockWeatherServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.seed)
+    print(f"One Call: {server.url}/onecall  Nominatim: {server.url}/search")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
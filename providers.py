@@ -0,0 +1,164 @@
+"""Geocoding and forecast backends behind one small interface.
+
+Forecast providers return One Call shaped dicts and geocoding providers
+return ``{"lat", "lon"}`` (or ``None`` when the place is unknown); both raise
+on transport or server errors. ``Hedged*Provider`` wraps several backends
+with a latency budget: the next backend is started when the current one
+errors or has not answered within ``hedge_after`` seconds, and the first
+successful answer wins.
+"""
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Set, TypeVar
+
+from geocoding import NOMINATIM_MIN_INTERVAL, NOMINATIM_URL, RateLimiter
+
+if TYPE_CHECKING:
+    from transport import Transport
+
+T = TypeVar("T")
+
+DEFAULT_HEDGE_AFTER = 2.0
+HEDGE_WORKERS = 8
+
+
+class ProviderError(OSError):
+    """Every backend of a hedged provider failed; ``errors`` holds each one's exception."""
+
+    def __init__(self, errors: List[BaseException]):
+        super().__init__("; ".join(f"{type(error).__name__}: {error}" for error in errors) or "no providers")
+        self.errors = errors
+
+
+class ForecastProvider:
+    name = "forecast"
+
+    def fetch(self, lat: float, lon: float, units: str, lang: str) -> dict:
+        raise NotImplementedError
+
+
+class GeocodingProvider:
+    name = "geocoding"
+
+    def geocode(self, query: str) -> Optional[Dict[str, float]]:
+        raise NotImplementedError
+
+    def set_rate(self, rate: float):
+        """Cap requests at ``rate`` per second (0 = unlimited); providers without a limit ignore it."""
+
+
+def _shared_transport(transport: Optional["Transport"]) -> "Transport":
+    if transport is not None:
+        return transport
+    # Imported on first use to keep requests off the startup path.
+    from transport import TRANSPORT
+    return TRANSPORT
+
+
+class OpenWeatherProvider(ForecastProvider):
+    """OpenWeatherMap One Call, or any server speaking the same schema at ``api_url``."""
+
+    def __init__(self, api_url: str, api_key: Optional[str], name: str = "openweather",
+                 timeout: float = 10, transport: Optional["Transport"] = None):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.name = name
+        self.timeout = timeout
+        self.transport = transport
+
+    def fetch(self, lat: float, lon: float, units: str, lang: str) -> dict:
+        params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": units, "lang": lang}
+        response = _shared_transport(self.transport).get(self.api_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class NominatimProvider(GeocodingProvider):
+    """Nominatim search, spaced ``min_interval`` seconds apart as its usage policy requires."""
+
+    def __init__(self, user_agent: str, url: str = NOMINATIM_URL, min_interval: float = NOMINATIM_MIN_INTERVAL,
+                 name: str = "nominatim", timeout: float = 8, transport: Optional["Transport"] = None):
+        self.user_agent = user_agent
+        self.url = url
+        self.name = name
+        self.timeout = timeout
+        self.transport = transport
+        self.rate_limiter = RateLimiter(min_interval)
+
+    def geocode(self, query: str) -> Optional[Dict[str, float]]:
+        self.rate_limiter.acquire()
+        params = {"q": query, "format": "json", "limit": 1}
+        headers = {"User-Agent": self.user_agent}
+        response = _shared_transport(self.transport).get(self.url, params=params, headers=headers,
+                                                         timeout=self.timeout)
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return {"lat": float(results[0]["lat"]), "lon": float(results[0]["lon"])}
+
+    def set_rate(self, rate: float):
+        self.rate_limiter.min_interval = 1.0 / rate if rate > 0 else 0.0
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+        return _executor
+
+
+def hedged_call(calls: Sequence[Callable[[], T]], hedge_after: float) -> T:
+    """Run ``calls`` in order, starting the next one on error or after ``hedge_after`` seconds.
+
+    Returns the first successful result; calls still running are left to
+    finish in the background and their results are discarded.
+    """
+    if len(calls) == 1:
+        return calls[0]()
+    executor = _hedge_executor()
+    remaining = list(calls)
+    running: Set[Future] = set()
+    errors: List[BaseException] = []
+    while remaining or running:
+        if remaining:
+            running.add(executor.submit(remaining.pop(0)))
+        done, _ = wait(running, timeout=hedge_after if remaining else None, return_when=FIRST_COMPLETED)
+        for future in done:
+            running.discard(future)
+            error = future.exception()
+            if error is None:
+                return future.result()
+            errors.append(error)
+    raise ProviderError(errors)
+
+
+class HedgedForecastProvider(ForecastProvider):
+    name = "hedged"
+
+    def __init__(self, providers: Sequence[ForecastProvider], hedge_after: float = DEFAULT_HEDGE_AFTER):
+        self.providers = list(providers)
+        self.hedge_after = hedge_after
+
+    def fetch(self, lat: float, lon: float, units: str, lang: str) -> dict:
+        return hedged_call([lambda p=p: p.fetch(lat, lon, units, lang) for p in self.providers], self.hedge_after)
+
+
+class HedgedGeocodingProvider(GeocodingProvider):
+    name = "hedged"
+
+    def __init__(self, providers: Sequence[GeocodingProvider], hedge_after: float = DEFAULT_HEDGE_AFTER):
+        self.providers = list(providers)
+        self.hedge_after = hedge_after
+
+    def geocode(self, query: str) -> Optional[Dict[str, float]]:
+        return hedged_call([lambda p=p: p.geocode(query) for p in self.providers], self.hedge_after)
+
+    def set_rate(self, rate: float):
+        for provider in self.providers:
+            provider.set_rate(rate)
@@ -0,0 +1,173 @@
+"""Derived weather metrics and recommendations, evaluated over whole series with NumPy.
+
+``assess`` runs once when a forecast arrives; showing the details of an entry
+is then a lookup into the returned ``Assessment``. Each point's matching
+rules are packed into a bitmask, and every distinct mask is turned into its
+message tuple only once.
+
+The default thresholds can be overridden with ``RULE_<FIELD>`` environment
+variables, e.g. ``RULE_HEAT=32`` or ``RULE_RAIN_WINDOW=6``.
+"""
+import math
+import operator
+import os
+import warnings
+from dataclasses import dataclass, fields
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from forecast_parser import WeatherPoint
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    rain_very_high: float = 0.8
+    rain_medium: float = 0.5
+    rain_low: float = 0.2
+    uv_high: float = 6
+    heat: float = 30
+    cold: float = 5
+    humidity_high: float = 80
+    # Dew-point spread (°C) at or below which fog or dew is likely.
+    fog_spread: float = 2.0
+    # Number of upcoming points covered by the rolling rain maximum.
+    rain_window: int = 3
+
+    @classmethod
+    def from_env(cls, prefix: str = "RULE_") -> "Thresholds":
+        """Defaults, overridden by ``<prefix><FIELD>`` environment variables that are set.
+
+        Values that don't parse, aren't finite or, for counts, aren't positive
+        keep the default with a warning, since this runs at import time.
+        """
+        overrides = {}
+        for field in fields(cls):
+            name = prefix + field.name.upper()
+            value = os.getenv(name)
+            if not value:
+                continue
+            try:
+                parsed = field.type(value)
+            except ValueError:
+                parsed = None
+            if parsed is None or not math.isfinite(parsed) or (field.type is int and parsed < 1):
+                warnings.warn(f"{name}={value!r} is not a valid {field.type.__name__}; using {field.default}")
+                continue
+            overrides[field.name] = parsed
+        return cls(**overrides)
+
+
+DEFAULT_THRESHOLDS = Thresholds.from_env()
+
+# Rain category: exactly one applies to every point.
+RAIN_NONE, RAIN_VERY_LOW, RAIN_LOW, RAIN_MEDIUM, RAIN_VERY_HIGH = range(5)
+RAIN_MESSAGES = (
+    "🌤️ No se espera lluvia. Disfruta tu día.",
+    "🌤️ Muy baja probabilidad de lluvia. Disfruta tu día.",
+    "🌦️ Baja probabilidad de lluvia. Probablemente no necesites paraguas.",
+    "🌦️ Probabilidad media de lluvia. Considera llevar paraguas.",
+    "☔ Muy alta probabilidad de lluvia. Lleva paraguas y ropa impermeable.",
+)
+# Additional rules, in display order; bit i of a point's mask selects message i.
+RULE_MESSAGES = (
+    "🧴 Usa protector solar, el índice UV es alto.",
+    "🥵 Hace calor, mantente hidratado.",
+    "🧥 Hace frío, abrígate bien.",
+    "💧 Humedad alta, puede sentirse bochornoso.",
+    "⏱️ Podría llover en las próximas horas.",
+    "🌫️ Temperatura cercana al punto de rocío, posible niebla.",
+    "🥵 La humedad hace que se sienta más calor que la temperatura.",
+    "🥶 El viento hace que se sienta más frío que la temperatura.",
+)
+PLEASANT_MESSAGE = "✅ El clima es agradable, ¡disfruta tu día!"
+RAIN_SHIFT = len(RULE_MESSAGES)
+
+
+@dataclass
+class Assessment:
+    heat_index: np.ndarray
+    wind_chill: np.ndarray
+    dew_point_spread: np.ndarray
+    rolling_max_pop: np.ndarray
+    recommendations: List[Tuple[str, ...]]
+
+
+_FIELDS = ("temp", "humidity", "pop", "uvi", "dew_point", "wind_speed")
+_COLUMNS = operator.attrgetter(*_FIELDS)
+
+
+def _columns(points: Sequence[WeatherPoint]) -> np.ndarray:
+    """The fields ``assess`` reads, one float row each, built in a single pass; ``None`` becomes NaN."""
+    return np.array([_COLUMNS(wp) for wp in points], dtype=float).reshape(-1, len(_FIELDS)).T
+
+
+def heat_index(temp_c: np.ndarray, humidity: np.ndarray) -> np.ndarray:
+    """NOAA heat index (Rothfusz regression), in °C; equals ``temp_c`` where it doesn't apply."""
+    t = temp_c * 9 / 5 + 32
+    rh = humidity
+    hi = (-42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh - 6.83783e-3 * t * t
+          - 5.481717e-2 * rh * rh + 1.22874e-3 * t * t * rh + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh)
+    return np.where((t >= 80) & (rh >= 40), (hi - 32) * 5 / 9, temp_c)
+
+
+def wind_chill(temp_c: np.ndarray, wind_ms: np.ndarray) -> np.ndarray:
+    """Environment Canada / NWS wind chill, in °C; equals ``temp_c`` where it doesn't apply."""
+    kmh = np.nan_to_num(wind_ms) * 3.6
+    v = np.power(kmh, 0.16)
+    wc = 13.12 + 0.6215 * temp_c - 11.37 * v + 0.3965 * temp_c * v
+    return np.where((temp_c <= 10) & (kmh > 4.8), wc, temp_c)
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Maximum of each value and the ``window - 1`` values after it, ignoring NaN."""
+    if not len(values) or window <= 1:
+        return values.copy()
+    padded = np.concatenate([np.where(np.isnan(values), -np.inf, values), np.full(window - 1, -np.inf)])
+    result = np.lib.stride_tricks.sliding_window_view(padded, window).max(axis=1)
+    result[np.isneginf(result)] = np.nan
+    return result
+
+
+_message_cache: Dict[int, Tuple[str, ...]] = {}
+
+
+def _messages(mask: int) -> Tuple[str, ...]:
+    messages = _message_cache.get(mask)
+    if messages is None:
+        rules = [message for bit, message in enumerate(RULE_MESSAGES) if mask & (1 << bit)]
+        messages = (RAIN_MESSAGES[mask >> RAIN_SHIFT], *rules) if rules else \
+            (RAIN_MESSAGES[mask >> RAIN_SHIFT], PLEASANT_MESSAGE)
+        _message_cache[mask] = messages
+    return messages
+
+
+def assess(points: Sequence[WeatherPoint], thresholds: Thresholds = DEFAULT_THRESHOLDS) -> Assessment:
+    temp, humidity, pop, uvi, dew_point, wind = _columns(points)
+
+    hi = heat_index(temp, humidity)
+    wc = wind_chill(temp, wind)
+    spread = temp - dew_point
+    upcoming_pop = rolling_max(pop, thresholds.rain_window)
+
+    with np.errstate(invalid="ignore"):
+        rain = np.select(
+            [np.isnan(pop), pop >= thresholds.rain_very_high, pop >= thresholds.rain_medium, pop >= thresholds.rain_low],
+            [RAIN_NONE, RAIN_VERY_HIGH, RAIN_MEDIUM, RAIN_LOW],
+            RAIN_VERY_LOW,
+        )
+        rules = (
+            uvi >= thresholds.uv_high,
+            temp >= thresholds.heat,
+            temp <= thresholds.cold,
+            humidity >= thresholds.humidity_high,
+            (upcoming_pop >= thresholds.rain_medium) & (pop < thresholds.rain_low),
+            spread <= thresholds.fog_spread,
+            (hi >= thresholds.heat) & (temp < thresholds.heat),
+            (wc <= thresholds.cold) & (temp > thresholds.cold),
+        )
+    masks = rain.astype(np.int64) << RAIN_SHIFT
+    for bit, matched in enumerate(rules):
+        masks |= matched.astype(np.int64) << bit
+
+    return Assessment(hi, wc, spread, upcoming_pop, [_messages(mask) for mask in masks.tolist()])
@@ -0,0 +1,35 @@
+import time
+from typing import List, Tuple
+
+
+class StartupProfile:
+    """Records named startup phases relative to the moment this module was imported.
+
+    ``main.py`` imports it first, so the first phase covers the remaining
+    top-level imports and later ones cover window construction, first paint
+    and the deferred chart/map/HTTP initialization.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        self.marks.append((phase, time.perf_counter()))
+
+    def elapsed_ms(self, phase: str) -> float:
+        for name, at in self.marks:
+            if name == phase:
+                return (at - self.t0) * 1000
+        raise KeyError(phase)
+
+    def report(self) -> str:
+        lines = [f"{'phase':<28}{'delta ms':>10}{'total ms':>10}"]
+        previous = self.t0
+        for name, at in self.marks:
+            lines.append(f"{name:<28}{(at - previous) * 1000:>10.1f}{(at - self.t0) * 1000:>10.1f}")
+            previous = at
+        return "\n".join(lines)
+
+
+STARTUP = StartupProfile()
@@ -0,0 +1,86 @@
+"""Shared fixtures. Every test runs against the in-process mock server and a throwaway cache directory.
+
+The environment is set here, before any test module imports ``weather_api``,
+because configuration is read at import time.
+"""
+import os
+import tempfile
+
+import pytest
+
+CACHE_DIR = tempfile.mkdtemp(prefix="weather-app-tests-")
+# Seconds the mock server waits before every answer, so a blocking call would be obvious.
+MOCK_LATENCY = 0.3
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.update(
+    WEATHER_PROVIDER="mock",
+    MOCK_LATENCY=str(MOCK_LATENCY),
+    MOCK_ERROR_RATE="0",
+    WEATHER_CACHE_DIR=CACHE_DIR,
+    FORECAST_CACHE_PATH=os.path.join(CACHE_DIR, "forecast.sqlite"),
+    GEOCODE_CACHE_PATH=os.path.join(CACHE_DIR, "geocode.sqlite"),
+    HISTORY_PATH=os.path.join(CACHE_DIR, "history.sqlite"),
+    WATCHLIST_PATH=os.path.join(CACHE_DIR, "watchlist.json"),
+    GAZETTEER_PATH="",
+)
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, Qt, QTimer  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+        app = QApplication([])
+    return app
+
+
+def run_until(predicate, timeout: float) -> bool:
+    """Run the Qt event loop until ``predicate()`` is true or ``timeout`` seconds pass."""
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: predicate() and loop.quit())
+    poll.start(10)
+    deadline = QTimer()
+    deadline.setSingleShot(True)
+    deadline.timeout.connect(loop.quit)
+    deadline.start(int(timeout * 1000))
+    if not predicate():
+        loop.exec_()
+    poll.stop()
+    deadline.stop()
+    return predicate()
+
+
+@pytest.fixture
+def window(qapp, monkeypatch):
+    import main
+    import rules  # noqa: F401  (numpy import is a one-off cost, not part of a search)
+
+    errors = []
+    monkeypatch.setattr(main.QMessageBox, "critical", lambda _parent, title, text: errors.append((title, text)))
+    monkeypatch.setattr(main.QMessageBox, "warning", lambda _parent, title, text: errors.append((title, text)))
+    win = main.WeatherWindow()
+    win.errors = errors
+    win.show()
+    assert run_until(lambda: win.chart is not None, timeout=30), "deferred startup did not finish"
+    yield win
+    win.close()
+    # Let downloads and prefetches finish before their signal objects go away.
+    win.thread_pool.waitForDone()
+    win.icons.thread_pool.clear()
+    win.icons.thread_pool.waitForDone()
+    win.deleteLater()
+    QApplication.processEvents()
+
+
+def search(win, location: str, timeout: float = 30) -> bool:
+    """Type ``location`` and run a search; true once the whole forecast is on screen."""
+    win.location_input.setText(location)
+    win.handle_location_search()
+    # _render_chart, the last stage, clears _search_started.
+    return run_until(lambda: win._search_started is None and win.last_location_name == location, timeout)
+
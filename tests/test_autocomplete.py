@@ -0,0 +1,18 @@
+from PyQt5.QtWidgets import QLineEdit
+
+from autocomplete import LocationCompleter
+from geocoding import Suggestion
+
+
+def test_choosing_suggestion_fills_line_edit(qapp):
+    line_edit = QLineEdit()
+    completer = LocationCompleter(line_edit)
+    chosen = []
+    completer.chosen.connect(lambda label, coords: chosen.append((label, coords)))
+    line_edit.setText("Li")
+    completer._show([Suggestion("Lima, Perú", -12.05, -77.04), Suggestion("Lisboa, Portugal", 38.72, -9.14)])
+
+    completer.completer.activated[str].emit("Lima, Perú")
+
+    assert line_edit.text() == "Lima, Perú"
+    assert chosen == [("Lima, Perú", {"lat": -12.05, "lon": -77.04})]
@@ -0,0 +1,22 @@
+import time
+
+from dashboard import WatchlistPanel
+from forecast_parser import parse_forecast
+from mock_server import mock_forecast
+from watchlist import Watchlist, WatchedLocation
+
+
+def test_refresh_for_removed_location_is_dropped(qapp, tmp_path):
+    panel = WatchlistPanel(Watchlist(str(tmp_path / "watchlist.json")))
+    location = WatchedLocation("Lima", -12.05, -77.04)
+    panel.model.add(location)
+    panel.table.selectRow(0)
+    panel.remove_selected()
+
+    # A refresh that was already running when the location was removed lands afterwards.
+    panel._store(location.key, parse_forecast(mock_forecast(location.lat, location.lon)), time.time())
+    panel._on_refresh_failed(location.key)
+
+    assert panel.model.rowCount() == 0
+    assert location.key not in panel.model.summaries
+    assert not panel._forecasts and not panel._fetched_at
@@ -0,0 +1,56 @@
+import pytest
+
+import forecast_cache
+from forecast_cache import ForecastCache
+
+DATA = {"hourly": [], "daily": []}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(forecast_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_fresh_stale_and_expired(clock):
+    cache = ForecastCache(":memory:", ttl=600, stale_ttl=3600)
+    cache.put(40.4168, -3.7038, "metric", "es", DATA)
+
+    entry = cache.get(40.4168, -3.7038, "metric", "es")
+    assert entry.fresh and entry.data == DATA
+    # Nearby coordinates share the entry.
+    assert cache.get(40.4161, -3.7041, "metric", "es") is not None
+    assert cache.get(40.4168, -3.7038, "imperial", "es") is None
+
+    clock[0] += 601
+    entry = cache.get(40.4168, -3.7038, "metric", "es")
+    assert entry is not None and not entry.fresh
+
+    clock[0] += 3600
+    assert cache.get(40.4168, -3.7038, "metric", "es") is None
+    assert cache.stats() == (2, 1, 2)
+
+
+def test_peek_is_not_counted(clock):
+    cache = ForecastCache(":memory:")
+    assert cache.peek(1, 2, "metric", "es") is None
+    cache.put(1, 2, "metric", "es", DATA)
+    assert cache.peek(1, 2, "metric", "es").fresh
+    assert cache.stats() == (0, 0, 0)
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ForecastCache(":memory:", max_entries=2)
+    cache.put(1, 1, "metric", "es", DATA)
+    clock[0] += 1
+    cache.put(2, 2, "metric", "es", DATA)
+    clock[0] += 1
+    # Reading (1, 1) makes (2, 2) the least recently used; the read is saved by the next put.
+    assert cache.get(1, 1, "metric", "es") is not None
+    clock[0] += 1
+    cache.put(3, 3, "metric", "es", DATA)
+
+    assert cache.peek(1, 1, "metric", "es") is not None
+    assert cache.peek(2, 2, "metric", "es") is None
+    assert cache.peek(3, 3, "metric", "es") is not None
@@ -0,0 +1,54 @@
+from PyQt5.QtCore import Qt
+
+from conftest import search
+from forecast_model import ForecastListModel
+from forecast_parser import parse_forecast
+from mock_server import mock_forecast
+
+
+def hourly_series():
+    series = parse_forecast(mock_forecast(40.4, -3.7), hours=48).hourly
+    assert len(series) == 48 and len(series.day_headers) >= 2
+    return series
+
+
+def test_header_rows_do_not_shift_point_indices(qapp):
+    series = hourly_series()
+    model = ForecastListModel(lambda wp: wp.dt_txt)
+    model.set_series(series, series.day_headers)
+    assert model.rowCount() == len(series) + len(series.day_headers)
+
+    points = []
+    for row in range(model.rowCount()):
+        index = model.index(row)
+        point = model.point_index(row)
+        if index.data(ForecastListModel.IsHeaderRole):
+            assert point == -1
+            assert model.flags(index) == Qt.NoItemFlags
+            # Every header sits right above the first point of its day.
+            assert model.point_index(row + 1) in series.day_headers
+            assert index.data() == series.day_headers[model.point_index(row + 1)]
+        else:
+            assert model.flags(index) & Qt.ItemIsSelectable
+            assert index.data() == series[point].dt_txt
+            points.append(point)
+    assert points == list(range(len(series)))
+    assert model.point_index(-1) == model.point_index(model.rowCount()) == -1
+
+
+def test_selecting_a_row_shows_its_point(window, monkeypatch):
+    assert search(window, "Lima")
+    shown = []
+    monkeypatch.setattr(window, "update_details", lambda wp, recommendations: shown.append(wp))
+    model = window.hourly_model
+    headers = [row for row in range(model.rowCount()) if model.index(row).data(ForecastListModel.IsHeaderRole)]
+    assert headers[0] == 0 and len(headers) >= 2
+
+    # The first hour of the second day, below two header rows.
+    row = headers[1] + 1
+    window.hourly_list.setCurrentIndex(model.index(row))
+    assert shown == [window.hourly_data[row - 2]]
+
+    # Header rows are not selectable and show nothing.
+    window.hourly_list.setCurrentIndex(model.index(headers[1]))
+    assert len(shown) == 1
@@ -0,0 +1,46 @@
+import sqlite3
+
+from geocoding import GeocodeCache, Geocoder
+from providers import GeocodingProvider
+
+
+class FixedProvider(GeocodingProvider):
+    def __init__(self):
+        self.queries = []
+
+    def geocode(self, query):
+        self.queries.append(query)
+        return {"lat": 4.71, "lon": -74.07}
+
+
+def test_suggestions_keep_the_searched_spelling():
+    geocoder = Geocoder(GeocodeCache(":memory:"), provider=FixedProvider())
+    assert geocoder.geocode("  Bogotá,   Colombia ") == {"lat": 4.71, "lon": -74.07}
+    assert [s.label for s in geocoder.suggest("bogo")] == ["Bogotá, Colombia"]
+    # Lookups still match regardless of accents and case.
+    assert geocoder.geocode("BOGOTA, colombia") is not None
+    assert len(geocoder.provider.queries) == 1
+
+
+def test_type_ahead_lookups_are_not_remembered():
+    provider = FixedProvider()
+    geocoder = Geocoder(GeocodeCache(":memory:"), provider=provider)
+    assert geocoder.geocode("bog", remember=False) is not None
+    assert geocoder.suggest("bog") == []
+    geocoder.geocode("bog", remember=False)
+    assert provider.queries == ["bog", "bog"]
+
+
+def test_cache_written_without_labels_still_suggests(tmp_path):
+    path = str(tmp_path / "geocode.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE places (query TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL,"
+                 " accessed_at REAL NOT NULL)")
+    conn.execute("INSERT INTO places VALUES ('lima', -12.05, -77.04, 0)")
+    conn.commit()
+    conn.close()
+
+    cache = GeocodeCache(path)
+    assert [s.label for s in cache.suggest("li", 5)] == ["lima"]
+    cache.put("lisboa", {"lat": 38.72, "lon": -9.14}, "Lisboa")
+    assert {s.label for s in cache.suggest("li", 5)} == {"lima", "Lisboa"}
@@ -0,0 +1,41 @@
+from conftest import run_until
+
+
+def test_load_icon_without_network(window, monkeypatch):
+    import icons
+
+    def offline(code, _directory):
+        raise OSError("offline")
+
+    monkeypatch.setattr(icons, "download_icon", offline)
+    # Neither bundled nor cached: the download runs in the background and, when it
+    # fails, the label just stays empty. Nothing may raise on the GUI thread.
+    window.load_icon("01d")
+    run_until(lambda: False, timeout=0.2)
+    assert not window.icons._in_flight
+    pixmap = window.icon_label.pixmap()
+    assert pixmap is None or pixmap.isNull()
+
+
+def test_failed_download_is_not_retried_until_due(qapp, tmp_path, monkeypatch):
+    import icons
+
+    attempts = []
+
+    def failing(code, _directory):
+        attempts.append(code)
+        raise OSError("offline")
+
+    monkeypatch.setattr(icons, "download_icon", failing)
+    store = icons.IconStore(str(tmp_path), bundled_dir=str(tmp_path / "bundled"))
+    store.prefetch(["10d"])
+    assert run_until(lambda: not store._in_flight, timeout=5)
+    store.prefetch(["10d"])
+    assert store.pixmap("10d") is None
+    assert attempts == ["10d"] and not store._in_flight
+
+    store.retry_after = 0.0
+    store._on_failed("10d")
+    store.prefetch(["10d"])
+    assert run_until(lambda: not store._in_flight, timeout=5)
+    assert attempts == ["10d", "10d"]
@@ -0,0 +1,46 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from metrics import METRICS, Metrics, MetricsExporter
+
+
+def test_export_posts_to_url():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append((self.headers["Content-Type"], self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.handle_request, daemon=True)
+    thread.start()
+    metrics = Metrics(enabled=True)
+    metrics.observe("geocode", 0.02)
+    metrics.inc("http_requests")
+    MetricsExporter(metrics, f"http://127.0.0.1:{server.server_address[1]}/metrics").export()
+    thread.join(timeout=5)
+    server.server_close()
+
+    content_type, body = received[0]
+    assert content_type.startswith("text/plain")
+    assert b'weather_stage_seconds_count{stage="geocode"} 1' in body
+    assert b"weather_http_requests_total 1" in body
+
+
+def test_debug_overlay_restores_metrics_setting(window, monkeypatch):
+    monkeypatch.setattr(METRICS, "enabled", False)
+    window.toggle_debug_overlay()
+    assert window.debug_overlay.isVisible() and METRICS.enabled
+    window.toggle_debug_overlay()
+    assert not window.debug_overlay.isVisible() and not METRICS.enabled
+
+    # Metrics enabled beforehand (WEATHER_METRICS=1) stay on.
+    METRICS.enabled = True
+    window.toggle_debug_overlay()
+    window.toggle_debug_overlay()
+    assert METRICS.enabled
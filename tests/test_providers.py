@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from mock_server import MockWeatherServer
+from providers import (
+    HedgedForecastProvider, HedgedGeocodingProvider, NominatimProvider, OpenWeatherProvider, ProviderError,
+    hedged_call,
+)
+from transport import Transport
+
+SLOW = 1.0
+# Without retries a failing backend errors at once instead of backing off first.
+TRANSPORT = Transport(retries=0)
+
+
+@pytest.fixture(scope="module")
+def servers():
+    started = {
+        "ok": MockWeatherServer().start(),
+        "slow": MockWeatherServer(latency=SLOW).start(),
+        "failing": MockWeatherServer(error_rate=1).start(),
+        "failing2": MockWeatherServer(error_rate=1).start(),
+    }
+    yield started
+    for server in started.values():
+        server.stop()
+
+
+def forecast(servers, *names, hedge_after=5.0):
+    providers = [OpenWeatherProvider(f"{servers[name].url}/onecall", "mock", name=name, transport=TRANSPORT) for name in names]
+    return HedgedForecastProvider(providers, hedge_after)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def test_failed_backend_fails_over_without_waiting(servers):
+    provider = forecast(servers, "failing", "ok")
+    data, elapsed = timed(lambda: provider.fetch(40.4, -3.7, "metric", "es"))
+    assert (data["lat"], data["lon"]) == (40.4, -3.7)
+    assert elapsed < 1.0
+
+    geocoding = HedgedGeocodingProvider([
+        NominatimProvider("test", url=f"{servers[name].url}/search", min_interval=0, name=name,
+                          transport=TRANSPORT)
+        for name in ("failing", "ok")
+    ])
+    assert geocoding.geocode("Madrid") is not None
+
+
+def test_slow_backend_is_hedged_after_budget(servers):
+    provider = forecast(servers, "slow", "ok", hedge_after=0.1)
+    data, elapsed = timed(lambda: provider.fetch(40.4, -3.7, "metric", "es"))
+    assert data["lat"] == 40.4
+    assert elapsed < SLOW / 2
+
+    # Within budget the primary answers and the fallback is never started.
+    provider = forecast(servers, "slow", "failing", hedge_after=SLOW * 3)
+    data, elapsed = timed(lambda: provider.fetch(40.4, -3.7, "metric", "es"))
+    assert data["lat"] == 40.4
+    assert elapsed >= SLOW
+
+
+def test_provider_error_when_every_backend_fails(servers):
+    provider = forecast(servers, "failing", "failing2")
+    with pytest.raises(ProviderError) as excinfo:
+        provider.fetch(40.4, -3.7, "metric", "es")
+    assert len(excinfo.value.errors) == 2
+    assert isinstance(excinfo.value, OSError)
+
+    def fail():
+        raise ValueError("bad response")
+
+    with pytest.raises(ProviderError) as excinfo:
+        hedged_call([fail, fail, fail], hedge_after=0.1)
+    assert [type(error) for error in excinfo.value.errors] == [ValueError] * 3
@@ -0,0 +1,76 @@
+import time
+
+from PyQt5.QtCore import QTimer
+
+from conftest import MOCK_LATENCY, run_until, search
+
+# Longest the event loop may stall while a search is in flight. Rendering a
+# forecast takes a few tens of ms; a network call on the GUI thread would take
+# at least MOCK_LATENCY.
+MAX_STALL_MS = 150
+
+
+def test_search_does_not_block_event_loop(window):
+    # The first search pays one-off costs (fonts, numpy, HTTP session) that aren't under test.
+    assert search(window, "Lima")
+
+    ticks = [time.perf_counter()]
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    timer.start(5)
+    assert search(window, "Madrid")
+    timer.stop()
+    ticks.append(time.perf_counter())
+
+    assert not window.errors
+    # Geocoding and the forecast each waited on the mock server...
+    assert ticks[-1] - ticks[0] >= 2 * MOCK_LATENCY
+    # ...without the timer ever going that long between ticks.
+    longest_stall_ms = max(b - a for a, b in zip(ticks, ticks[1:])) * 1000
+    assert longest_stall_ms < MAX_STALL_MS
+    assert window.hourly_model.rowCount() > 0
+
+
+def test_slow_icon_downloads_do_not_delay_search(window, monkeypatch):
+    import icons
+
+    def slow_download(code, _directory):
+        time.sleep(1.0)
+        raise OSError("timed out")
+
+    monkeypatch.setattr(icons, "download_icon", slow_download)
+    threads = window.thread_pool.maxThreadCount()
+    window.thread_pool.setMaxThreadCount(4)
+    try:
+        # Each search queues a download per distinct icon code.
+        assert search(window, "Lima")
+        started = time.perf_counter()
+        assert search(window, "Madrid")
+        elapsed = time.perf_counter() - started
+    finally:
+        window.thread_pool.setMaxThreadCount(threads)
+    assert elapsed < 2 * MOCK_LATENCY + 0.5
+
+
+def test_failed_revalidation_keeps_cached_forecast(window, monkeypatch):
+    import forecast_cache
+    import main
+    from mock_server import mock_forecast, mock_geocode
+
+    result = mock_geocode("Quito")[0]
+    lat, lon = float(result["lat"]), float(result["lon"])
+    # Stored long enough ago to be stale, but not expired.
+    fetched_at = time.time() - main.FORECAST_CACHE.ttl - 60
+    with monkeypatch.context() as patch:
+        patch.setattr(forecast_cache.time, "time", lambda: fetched_at)
+        main.FORECAST_CACHE.put(lat, lon, main.UNITS, main.LANG, mock_forecast(lat, lon))
+
+    def offline(coords):
+        raise OSError("network unreachable")
+
+    monkeypatch.setattr(main, "fetch_forecast", offline)
+    monkeypatch.setattr(main.QMessageBox, "critical", lambda _parent, title, text: window.errors.append(title))
+    assert search(window, "Quito")
+    assert run_until(lambda: not window.loader_label.isVisible(), timeout=5)
+    assert not window.errors
+    assert window.hourly_model.rowCount() > 0
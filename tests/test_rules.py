@@ -0,0 +1,39 @@
+import pytest
+
+from forecast_parser import parse_forecast
+from mock_server import mock_forecast
+from rules import PLEASANT_MESSAGE, RAIN_MESSAGES, Thresholds, assess
+
+
+def test_thresholds_from_env(monkeypatch):
+    monkeypatch.setenv("RULE_HEAT", "32.5")
+    monkeypatch.setenv("RULE_RAIN_WINDOW", "6")
+    monkeypatch.setenv("RULE_COLD", "")
+    thresholds = Thresholds.from_env()
+    assert thresholds.heat == 32.5
+    assert thresholds.rain_window == 6 and isinstance(thresholds.rain_window, int)
+    assert thresholds.cold == Thresholds().cold
+
+
+@pytest.mark.parametrize("name, value", [
+    ("RULE_RAIN_WINDOW", "6.0"), ("RULE_RAIN_WINDOW", "0"), ("RULE_HEAT", "abc"), ("RULE_COLD", "nan"),
+])
+def test_invalid_threshold_keeps_default(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    monkeypatch.setenv("RULE_HUMIDITY_HIGH", "70")
+    with pytest.warns(UserWarning, match=name):
+        thresholds = Thresholds.from_env()
+    field = name[len("RULE_"):].lower()
+    assert getattr(thresholds, field) == getattr(Thresholds(), field)
+    assert thresholds.humidity_high == 70
+
+
+def test_assess_thresholds_change_recommendations():
+    points = parse_forecast(mock_forecast(40.4, -3.7), hours=48).hourly.points
+    # Nothing counts as hot, cold, humid, sunny or foggy, and no rain is expected.
+    relaxed = Thresholds(rain_very_high=2, rain_medium=2, rain_low=2, uv_high=99, heat=99, cold=-99,
+                         humidity_high=101, fog_spread=-99)
+    recommendations = assess(points, relaxed).recommendations
+    assert len(recommendations) == len(points)
+    assert set(recommendations) == {(RAIN_MESSAGES[1], PLEASANT_MESSAGE)}
+    assert assess([]).recommendations == []
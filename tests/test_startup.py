@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# First paint measured at ~145 ms (offscreen, no QtWebEngine); about twice that leaves room
+# for slower machines while still catching an eager import sneaking onto the startup path.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "300"))
+
+
+def test_first_paint_within_budget():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "main.py"), "--profile-startup", "--startup-budget", str(STARTUP_BUDGET_MS)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "first paint" in result.stderr
@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 10
+MAX_VALIDATED_RESPONSES = 256
+MAX_TIMINGS = 500
+
+# Connection setup times measured by the pooled connections of the current thread.
+_conn_timings = threading.local()
+
+
+class _ConnectTimingMixin:
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        _conn_timings.tcp = time.perf_counter() - start
+        return sock
+
+    def connect(self):
+        _conn_timings.tcp = 0.0
+        start = time.perf_counter()
+        super().connect()
+        _conn_timings.connect = time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_ConnectTimingMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_ConnectTimingMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+@dataclass
+class RequestTiming:
+    """Where the time of one request went, in seconds.
+
+    ``connect`` covers name resolution and the TCP handshake (urllib3 does both
+    in one call), ``tls`` the TLS handshake, and ``ttfb`` the wait from sending
+    the request to the response headers. All three are zero on a reused
+    keep-alive connection.
+    """
+    url: str
+    status: int
+    connect: float
+    tls: float
+    ttfb: float
+    total: float
+    reused: bool
+    revalidated: bool
+
+
+class Transport:
+    """Shared HTTP client: pooled keep-alive connections per host, retries
+    with exponential backoff on 429/5xx, gzip, and ETag/Last-Modified
+    revalidation for hosts that send validators.
+    """
+
+    def __init__(self, retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = _TimedAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.timings: Deque[RequestTiming] = deque(maxlen=MAX_TIMINGS)
+        self._validated: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[Dict[str, str]] = None,
+            timeout: float = 10) -> requests.Response:
+        request = self.session.prepare_request(requests.Request("GET", url, params=params, headers=headers))
+        with self._lock:
+            cached = self._validated.get(request.url)
+            if cached is not None:
+                self._validated.move_to_end(request.url)
+        if cached is not None:
+            if "ETag" in cached.headers:
+                request.headers["If-None-Match"] = cached.headers["ETag"]
+            if "Last-Modified" in cached.headers:
+                request.headers["If-Modified-Since"] = cached.headers["Last-Modified"]
+
+        _conn_timings.connect = None
+        _conn_timings.tcp = 0.0
+        start = time.perf_counter()
+        try:
+            response = self.session.send(request, timeout=timeout)
+        except requests.RequestException:
+            METRICS.inc("network_errors")
+            raise
+        total = time.perf_counter() - start
+
+        revalidated = cached is not None and response.status_code == 304
+        self._record(request.url, response, total, revalidated)
+        if revalidated:
+            return cached
+        if response.ok and ("ETag" in response.headers or "Last-Modified" in response.headers):
+            with self._lock:
+                self._validated[request.url] = response
+                self._validated.move_to_end(request.url)
+                while len(self._validated) > MAX_VALIDATED_RESPONSES:
+                    self._validated.popitem(last=False)
+        return response
+
+    def _record(self, url: str, response: requests.Response, total: float, revalidated: bool):
+        connect_total = getattr(_conn_timings, "connect", None)
+        reused = connect_total is None
+        connect = 0.0 if reused else _conn_timings.tcp
+        tls = 0.0 if reused else max(0.0, connect_total - connect)
+        ttfb = max(0.0, response.elapsed.total_seconds() - (connect_total or 0.0))
+        parts = urlsplit(url)
+        # Query strings are dropped so API keys never end up in the timing log.
+        timing = RequestTiming(f"{parts.scheme}://{parts.netloc}{parts.path}", response.status_code,
+                               connect, tls, ttfb, total, reused, revalidated)
+        self.timings.append(timing)
+        METRICS.inc("http_requests")
+        if timing.status >= 400:
+            METRICS.inc("http_errors")
+        logger.debug("%s %s connect=%.3fs tls=%.3fs ttfb=%.3fs total=%.3fs reused=%s revalidated=%s",
+                     timing.status, timing.url, timing.connect, timing.tls, timing.ttfb, timing.total,
+                     timing.reused, timing.revalidated)
+
+
+TRANSPORT = Transport()
@@ -0,0 +1,108 @@
+"""Saved locations and the scheduling policy that keeps their forecasts fresh.
+
+Qt-free: ``dashboard.py`` drives it from a ``QTimer`` and worker threads.
+"""
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from forecast_parser import Forecast, emoji_for
+
+DEFAULT_INTERVAL = 10 * 60
+DEFAULT_SPREAD = 2 * 60
+DEFAULT_MAX_PER_TICK = 2
+
+
+@dataclass
+class WatchedLocation:
+    name: str
+    lat: float
+    lon: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.lat:.4f},{self.lon:.4f}"
+
+
+@dataclass
+class LocationSummary:
+    temp: float
+    description: str
+    emoji: str
+    max_pop: Optional[float]
+    fetched_at: float
+
+
+def summarize(forecast: Forecast, fetched_at: float, hours: int = 12) -> Optional[LocationSummary]:
+    """Current conditions plus the highest rain probability over the next ``hours``."""
+    if not len(forecast.hourly):
+        return None
+    now = forecast.hourly[0]
+    pops = [wp.pop for wp in forecast.hourly.points[:hours] if wp.pop is not None]
+    return LocationSummary(now.temp, now.weather, emoji_for(now.icon), max(pops) if pops else None, fetched_at)
+
+
+class Watchlist:
+    """Ordered list of watched locations persisted as JSON at ``path``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.locations: List[WatchedLocation] = []
+        try:
+            with open(path, encoding="utf-8") as fh:
+                self.locations = [WatchedLocation(**item) for item in json.load(fh)]
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def add(self, location: WatchedLocation) -> bool:
+        if any(existing.key == location.key for existing in self.locations):
+            return False
+        self.locations.append(location)
+        self.save()
+        return True
+
+    def remove(self, index: int):
+        del self.locations[index]
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump([asdict(location) for location in self.locations], fh, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class RefreshScheduler:
+    """Decides which locations to refresh on each tick.
+
+    A location is due ``interval`` seconds (the provider's update cadence)
+    after its last fetch, plus a stable per-location offset in ``[0, spread)``
+    so a large watchlist doesn't come due all at once. At most
+    ``max_per_tick`` locations are returned per tick, oldest first, which caps
+    the request rate at ``max_per_tick`` per timer period.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, spread: float = DEFAULT_SPREAD,
+                 max_per_tick: int = DEFAULT_MAX_PER_TICK):
+        self.interval = interval
+        self.spread = spread
+        self.max_per_tick = max_per_tick
+
+    def offset(self, key: str) -> float:
+        return (zlib.crc32(key.encode()) % 1000) / 1000 * self.spread
+
+    def due(self, fetched_at: Dict[str, float], keys: List[str], now: float,
+            in_flight: Optional[set] = None) -> List[str]:
+        candidates = []
+        for key in keys:
+            if in_flight and key in in_flight:
+                continue
+            last = fetched_at.get(key)
+            due_at = 0.0 if last is None else last + self.interval + self.offset(key)
+            if due_at <= now:
+                candidates.append((due_at, key))
+        candidates.sort()
+        return [key for _, key in candidates[:self.max_per_tick]]
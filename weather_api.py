@@ -0,0 +1,142 @@
+"""Qt-free data layer: configuration, geocoding and forecast download.
+
+Everything here is safe to import from worker threads and headless tools
+(see ``batch.py``); nothing imports PyQt5 or matplotlib.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from forecast_cache import ForecastCache
+from forecast_parser import Forecast, parse_forecast
+from geocoding import GeocodeCache, Gazetteer, Geocoder, Suggestion
+from history import HistoryStore, location_key
+from metrics import METRICS
+from providers import (
+    DEFAULT_HEDGE_AFTER, ForecastProvider, GeocodingProvider, HedgedForecastProvider, HedgedGeocodingProvider,
+    NominatimProvider, OpenWeatherProvider,
+)
+
+# =================== CONFIGURATION ===================
+load_dotenv()
+
+API_KEY = os.getenv("OPENWEATHER_API_KEY")
+API_URL = os.getenv("API_URL")
+EMAIL_MAP = os.getenv("EMAIL_MAP")
+# "openweather" (default) or "mock" to use a local mock server instead of the real APIs.
+WEATHER_PROVIDER = os.getenv("WEATHER_PROVIDER", "openweather")
+# Optional second One Call compatible endpoint, raced against API_URL when it is slow or failing.
+FALLBACK_API_URL = os.getenv("FALLBACK_API_URL")
+FALLBACK_API_KEY = os.getenv("FALLBACK_API_KEY", API_KEY)
+# Optional second Nominatim compatible search endpoint, raced the same way.
+FALLBACK_GEOCODE_URL = os.getenv("FALLBACK_GEOCODE_URL")
+PROVIDER_HEDGE_AFTER = float(os.getenv("PROVIDER_HEDGE_AFTER", str(DEFAULT_HEDGE_AFTER)))
+UNITS = "metric"
+LANG = "es"
+# One Call returns 48 hourly and 8 daily entries.
+FORECAST_HOURS = 48
+FORECAST_DAYS = 8
+
+CACHE_DIR = os.path.expanduser(os.getenv("WEATHER_CACHE_DIR", "~/.cache/weather-app"))
+
+FORECAST_CACHE = ForecastCache(
+    os.path.expanduser(os.getenv("FORECAST_CACHE_PATH", os.path.join(CACHE_DIR, "forecast.sqlite"))),
+    precision=int(os.getenv("FORECAST_CACHE_PRECISION", "2")),
+)
+
+METRICS.collectors.append(lambda: dict(zip(
+    ("forecast_cache_hits", "forecast_cache_stale_hits", "forecast_cache_misses"), FORECAST_CACHE.stats())))
+
+HISTORY = HistoryStore(os.path.expanduser(os.getenv("HISTORY_PATH", os.path.join(CACHE_DIR, "history.sqlite"))))
+
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH")
+_geocoder: Optional[Geocoder] = None
+_forecast_provider: Optional[ForecastProvider] = None
+_mock_server = None
+_providers_lock = threading.Lock()
+
+def _mock_url() -> str:
+    global _mock_server
+    if _mock_server is None:
+        from mock_server import MockWeatherServer
+        _mock_server = MockWeatherServer(
+            latency=float(os.getenv("MOCK_LATENCY", "0")),
+            jitter=float(os.getenv("MOCK_JITTER", "0")),
+            error_rate=float(os.getenv("MOCK_ERROR_RATE", "0")),
+            seed=int(os.getenv("MOCK_SEED", "0")),
+        ).start()
+    return _mock_server.url
+
+def _geocoding_provider() -> GeocodingProvider:
+    if WEATHER_PROVIDER == "mock":
+        return NominatimProvider("WeatherApp/1.0", url=f"{_mock_url()}/search", min_interval=0, name="mock")
+    provider = NominatimProvider(f"WeatherApp/1.0 {EMAIL_MAP}")
+    if FALLBACK_GEOCODE_URL:
+        fallback = NominatimProvider(f"WeatherApp/1.0 {EMAIL_MAP}", url=FALLBACK_GEOCODE_URL, name="fallback")
+        return HedgedGeocodingProvider([provider, fallback], PROVIDER_HEDGE_AFTER)
+    return provider
+
+def get_forecast_provider() -> ForecastProvider:
+    global _forecast_provider
+    with _providers_lock:
+        if _forecast_provider is None:
+            if WEATHER_PROVIDER == "mock":
+                _forecast_provider = OpenWeatherProvider(f"{_mock_url()}/onecall", "mock", name="mock")
+            else:
+                _forecast_provider = OpenWeatherProvider(API_URL, API_KEY)
+                if FALLBACK_API_URL:
+                    _forecast_provider = HedgedForecastProvider(
+                        [_forecast_provider, OpenWeatherProvider(FALLBACK_API_URL, FALLBACK_API_KEY, name="fallback")],
+                        PROVIDER_HEDGE_AFTER,
+                    )
+        return _forecast_provider
+
+def get_geocoder() -> Geocoder:
+    """Build the shared geocoder on first use; loading the gazetteer can take a while."""
+    global _geocoder
+    with _providers_lock:
+        if _geocoder is None:
+            _geocoder = Geocoder(
+                GeocodeCache(os.path.expanduser(os.getenv("GEOCODE_CACHE_PATH", os.path.join(CACHE_DIR, "geocode.sqlite")))),
+                Gazetteer.from_geonames(os.path.expanduser(GAZETTEER_PATH)) if GAZETTEER_PATH else None,
+                _geocoding_provider(),
+            )
+        return _geocoder
+
+# =================== NETWORKING ===================
+def suggest_locations(text: str, limit: int = 5) -> List[Suggestion]:
+    with METRICS.stage("suggest"):
+        return get_geocoder().suggest(text, limit)
+
+def set_geocode_rate(rate: float):
+    """Cap remote geocoding at ``rate`` requests per second (0 = unlimited), e.g. for batch runs."""
+    geocoder = get_geocoder()
+    if geocoder.provider is not None:
+        geocoder.provider.set_rate(rate)
+
+def geocode_location(location_name: str, remember: bool = True) -> Optional[Dict[str, float]]:
+    with METRICS.stage("geocode"):
+        return get_geocoder().geocode(location_name, remember)
+
+def fetch_weather(coords: Dict[str, float]) -> dict:
+    """Download the One Call forecast for ``coords``; raises ``requests.RequestException`` or ``ProviderError``."""
+    try:
+        with METRICS.stage("forecast_fetch"):
+            data = get_forecast_provider().fetch(coords["lat"], coords["lon"], UNITS, LANG)
+    except Exception:
+        METRICS.inc("forecast_errors")
+        raise
+    FORECAST_CACHE.put(coords["lat"], coords["lon"], UNITS, LANG, data)
+    return data
+
+def fetch_forecast(coords: Dict[str, float]) -> Forecast:
+    """Download, parse and record in the history the forecast for ``coords``; meant to run in a worker thread."""
+    data = fetch_weather(coords)
+    with METRICS.stage("forecast_parse"):
+        forecast = parse_forecast(data, FORECAST_HOURS, FORECAST_DAYS)
+    with METRICS.stage("history_record"):
+        HISTORY.record(location_key(coords["lat"], coords["lon"]), int(time.time()), forecast)
+    return forecast